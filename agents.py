@@ -1,29 +1,29 @@
  
 from mesa import Agent
-import random
 
 class WorkerAgent(Agent):
     """Worker agent that decides on reskilling, adapting, or resisting automation."""
     
     def __init__(self, unique_id, model):
         super().__init__(unique_id, model)
-        self.skill_level = random.uniform(0.3, 0.9)  # Initial skill level
-        self.adaptability = random.uniform(0.2, 0.8)  # How willing to reskill
+        self.skill_level = model.worker_random.uniform(0.3, 0.9)  # Initial skill level
+        self.adaptability = model.worker_random.uniform(0.2, 0.8)  # How willing to reskill
         self.employed = True
         self.well_being = 0.7
         
     def step(self):
         # Decision to reskill based on automation threat
         automation_threat = self.model.automation_level
+        rng = self.model.worker_random  # Per-model stream, see WorkFutureModel
         
         if automation_threat > self.skill_level:
-            if random.random() < self.adaptability:
+            if rng.random() < self.adaptability:
                 # Reskill
                 self.skill_level += 0.1
                 self.well_being -= 0.05  # Short-term stress
             else:
                 # Risk of unemployment
-                if random.random() < automation_threat - self.skill_level:
+                if rng.random() < automation_threat - self.skill_level:
                     self.employed = False
                     self.well_being -= 0.2
         
@@ -0,0 +1,350 @@
+from model import WorkFutureModel, WorkerAgent
+from sharded import ShardedModel
+from mesa import Agent
+import call_center_classifier as ccc
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+import argparse
+import gc
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+def run_model(steps, **params):
+    """Run one model and return its collected DataFrame."""
+    model = WorkFutureModel(**params)
+    for _ in range(steps):
+        model.step()
+    return model.datacollector.get_model_vars_dataframe()
+
+def benchmark_worker_engine(sizes=(10_000, 100_000, 1_000_000), steps=10, num_corporations=10):
+    """Time model construction plus stepping for both worker engines."""
+    results = {}
+    for num_workers in sizes:
+        timings = {}
+        for vectorized in (False, True):
+            start = time.perf_counter()
+            run_model(steps, num_workers=num_workers, num_corporations=num_corporations,
+                      vectorized=vectorized, seed=0)
+            timings["vectorized" if vectorized else "object"] = time.perf_counter() - start
+        timings["speedup"] = timings["object"] / timings["vectorized"]
+        results[num_workers] = timings
+        print(f"{num_workers:>9} workers: object {timings['object']:.2f}s, "
+              f"vectorized {timings['vectorized']:.3f}s, speedup {timings['speedup']:.0f}x")
+    return results
+
+def benchmark_sharded(num_workers=1_000_000, shard_counts=(1, 2, 4, 8), steps=10):
+    """Time stepping one large economy with its workers split across processes."""
+    results = {}
+    for num_shards in shard_counts:
+        with ShardedModel(num_workers=num_workers, num_shards=num_shards, seed=0) as model:
+            model.step()  # Shards have built their workers once the first tick returns
+            start = time.perf_counter()
+            for _ in range(steps):
+                model.step()
+            results[num_shards] = (time.perf_counter() - start) / steps
+        print(f"{num_workers} workers on {num_shards} shard(s): "
+              f"{results[num_shards] * 1000:.1f} ms/step")
+    return results
+
+class _DictWorkerAgent(Agent):
+    """The pre-__slots__ WorkerAgent layout: a Mesa Agent holding its state in __dict__."""
+
+    def __init__(self, unique_id, model, rng):
+        super().__init__(unique_id, model)
+        self.skill_level = rng.uniform(0.3, 0.9)
+        self.adaptability = rng.uniform(0.2, 0.8)
+        self._employed = True
+        self.well_being = 0.7
+
+def _traced_bytes(build):
+    """Bytes still allocated after build() returns, with the result kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+def benchmark_worker_memory(num_workers=100_000, steps=3):
+    """Report bytes per worker: old dict layout vs slotted WorkerAgent, and per engine."""
+    model = WorkFutureModel(num_workers=0, num_corporations=1, seed=0)
+    rng = random.Random(0)
+
+    def dict_agents():
+        return [_DictWorkerAgent(i, model, rng) for i in range(num_workers)]
+
+    def slotted_agents():
+        return [WorkerAgent(i, model) for i in range(num_workers)]
+
+    def build_model(vectorized):
+        def build():
+            m = WorkFutureModel(num_workers=num_workers, seed=0, vectorized=vectorized)
+            for _ in range(steps):
+                m.step()
+            return m
+        return build
+
+    results = {
+        "dict_agent": _traced_bytes(dict_agents) / num_workers,
+        "slotted_agent": _traced_bytes(slotted_agents) / num_workers,
+        "model_objects": _traced_bytes(build_model(False)) / num_workers,
+        "model_vectorized": _traced_bytes(build_model(True)) / num_workers,
+    }
+    print(f"Bytes per worker at {num_workers}: agent instance {results['dict_agent']:.0f} "
+          f"before / {results['slotted_agent']:.0f} after; whole model "
+          f"{results['model_objects']:.0f} object path / {results['model_vectorized']:.0f} vectorized")
+    return results
+
+def reference_classify(activity):
+    """classify_activity as originally written: fuzzy_match over every keyword."""
+    text = activity.lower()
+    for label, keywords in ccc.CATEGORIES:
+        if ccc.fuzzy_match(text, keywords):
+            return label
+    return 'unclassified'
+
+def synthetic_activities(count, seed=0):
+    """Activity strings mixing keyword hits, near-miss typos and unrelated text."""
+    rng = random.Random(seed)
+    keywords = [kw for _, kws in ccc.CATEGORIES for kw in kws]
+    verbs = ["Performing", "Handling", "Coordinating", "Providing", "Managing", "Preparing"]
+    objects = ["customer accounts", "billing inquiries", "service requests", "team schedules",
+               "product information", "complaints and feedback", "order status"]
+    activities = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.3:
+            text = f"{rng.choice(verbs)} {rng.choice(objects)} by {rng.choice(keywords)} details"
+        elif kind < 0.5:
+            # Short, keyword-length strings with one typo exercise the fuzzy path
+            kw = list(rng.choice(keywords))
+            kw[rng.randrange(len(kw))] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+            text = "".join(kw)
+        else:
+            text = f"{rng.choice(verbs)} {rng.choice(objects)} for {rng.choice(objects)}"
+        activities.append(text)
+    return activities
+
+def benchmark_classifier(count=20_000, seed=0):
+    """Time the compiled classifier against the original per-keyword difflib scan."""
+    activities = synthetic_activities(count, seed)
+
+    start = time.perf_counter()
+    expected = [reference_classify(a) for a in activities]
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    labels = [ccc.classify_activity(a) for a in activities]
+    compiled_time = time.perf_counter() - start
+
+    mismatches = sum(a != b for a, b in zip(expected, labels))
+    if mismatches:
+        raise AssertionError(f"{mismatches} labels differ from the reference classifier")
+    print(f"{count} activities: reference {reference_time:.2f}s, compiled {compiled_time:.3f}s, "
+          f"speedup {reference_time / compiled_time:.0f}x")
+    return {"reference": reference_time, "compiled": compiled_time,
+            "speedup": reference_time / compiled_time}
+
+# (num_workers, num_corporations) for the suite; --quick keeps the first two
+SUITE_SIZES = [(1_000, 10), (10_000, 100), (100_000, 1_000), (1_000_000, 10_000)]
+# The object engine is skipped above this many workers, where a run takes minutes
+OBJECT_ENGINE_LIMIT = 100_000
+SUITE_SEED = 0
+
+def round_times(func, setup=None, repeat=5, min_time=0.2):
+    """Per-call wall time of func(setup()) in each of repeat rounds, in seconds.
+
+    Like timeit: each round calls func until at least min_time has been spent
+    in it, and its mean is recorded. setup runs untimed before every call.
+    """
+    rounds = []
+    for _ in range(repeat):
+        gc.collect()
+        calls, elapsed = 0, 0.0
+        while elapsed < min_time:
+            arg = setup() if setup is not None else None
+            start = time.perf_counter()
+            func(arg)
+            elapsed += time.perf_counter() - start
+            calls += 1
+        rounds.append(elapsed / calls)
+    return rounds
+
+def timing(rounds, **derived):
+    """Suite result for per-round times: the best as "seconds", plus every round."""
+    return {"seconds": min(rounds), "rounds": rounds, **derived}
+
+def _run_steps(model, steps):
+    for _ in range(steps):
+        model.step()
+
+def suite_model(sizes, steps=10, repeat=5):
+    """Construction time and step throughput per (engine, workers, corporations)."""
+    results = {}
+    for num_workers, num_corporations in sizes:
+        for vectorized in (False, True):
+            if not vectorized and num_workers > OBJECT_ENGINE_LIMIT:
+                continue
+            engine = "vectorized" if vectorized else "object"
+            params = dict(num_workers=num_workers, num_corporations=num_corporations,
+                          vectorized=vectorized, seed=SUITE_SEED)
+            construct = round_times(lambda _: WorkFutureModel(**params), repeat=repeat)
+            step = [seconds / steps for seconds in
+                    round_times(lambda model: _run_steps(model, steps),
+                                setup=lambda: WorkFutureModel(**params), repeat=repeat)]
+            name = f"model/{engine}/w{num_workers}/c{num_corporations}"
+            results[name + "/construct"] = timing(construct)
+            results[name + "/step"] = timing(step, steps_per_second=1 / min(step))
+    return results
+
+def suite_collector(num_workers=10_000, num_corporations=100, warmup=5, repeat=5):
+    """Time of one metrics collection, and its share of a collecting step."""
+    results = {}
+    for vectorized in (False, True):
+        engine = "vectorized" if vectorized else "object"
+        model = WorkFutureModel(num_workers=num_workers, num_corporations=num_corporations,
+                                vectorized=vectorized, collect_every=1, seed=SUITE_SEED)
+        _run_steps(model, warmup)
+        collect = round_times(lambda _: model.datacollector.collect(model), repeat=repeat)
+        step = round_times(lambda _: model.step(), repeat=repeat)
+        results[f"collector/{engine}/w{num_workers}"] = timing(
+            collect, overhead_fraction=min(collect) / min(step))
+    return results
+
+def suite_scenarios(steps=50, repeat=3):
+    """The scenario_tester sweep end to end, in-process so it is not bound by core count."""
+    from scenario_tester import create_scenarios, run_all_scenarios, analyze
+
+    scenarios = create_scenarios()
+
+    def run(_):
+        with redirect_stdout(io.StringIO()):
+            for data in run_all_scenarios(scenarios, max_workers=1, seed=SUITE_SEED,
+                                          steps=steps).values():
+                analyze(data)
+    return {"scenario_tester/sweep": timing(round_times(run, repeat=repeat),
+                                            scenarios=len(scenarios))}
+
+def suite_classifier(sizes=(1_000, 20_000), repeat=3):
+    """Classifier throughput on synthetic corpora, uncached and through ClassificationCache."""
+    results = {}
+    for count in sizes:
+        activities = synthetic_activities(count, seed=SUITE_SEED)
+        rounds = round_times(lambda _: [ccc.classify_activity(a) for a in activities],
+                             repeat=repeat)
+        results[f"classifier/compiled/n{count}"] = timing(
+            rounds, items_per_second=count / min(rounds))
+        # Real job data repeats activities heavily; draw the corpus from a tenth as many strings
+        rng = random.Random(SUITE_SEED)
+        repeated = [rng.choice(activities[:max(count // 10, 1)]) for _ in range(count)]
+
+        def cached(cache):
+            for a in repeated:
+                cache.classify(a)
+        rounds = round_times(cached, setup=ccc.ClassificationCache, repeat=repeat)
+        results[f"classifier/cached/n{count}"] = timing(
+            rounds, items_per_second=count / min(rounds))
+    return results
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(quick=False):
+    """Run every suite benchmark with fixed seeds; returns {"meta": ..., "results": ...}.
+
+    Each result has "seconds" (lower is better, fastest of several repeats),
+    "rounds" (every repeat's time) and any derived rates. quick limits model sizes to the two smallest.
+    """
+    sizes = SUITE_SIZES[:2] if quick else SUITE_SIZES
+    results = {}
+    for name, bench in [("model", lambda: suite_model(sizes)),
+                        ("collector", suite_collector),
+                        ("scenarios", suite_scenarios),
+                        ("classifier", suite_classifier)]:
+        print(f"Running {name} benchmarks...", flush=True)
+        results.update(bench())
+    meta = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "seed": SUITE_SEED,
+    }
+    return {"meta": meta, "results": results}
+
+def compare_results(baseline, current, threshold=0.20):
+    """Compare two suite results; returns {name: relative change} for the regressions.
+
+    A benchmark regressed when its best time is more than threshold slower
+    than the baseline's best and also slower than the baseline's worst round,
+    so a change within the baseline's own run-to-run spread is never flagged.
+    Benchmarks missing from either side are ignored, so suites from different
+    sizes or commits can still be compared on what they share.
+    """
+    regressions = {}
+    print(f"{'benchmark':<45} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or before["seconds"] <= 0:
+            continue
+        change = result["seconds"] / before["seconds"] - 1
+        # Results saved before rounds were recorded only have their best time
+        worst = max(before.get("rounds", [before["seconds"]]))
+        regressed = change > threshold and result["seconds"] > worst
+        flag = "  REGRESSION" if regressed else "  (within noise)" if change > threshold else ""
+        print(f"{name:<45} {before['seconds']:>10.4g} {result['seconds']:>10.4g} "
+              f"{change:>+8.1%}{flag}")
+        if regressed:
+            regressions[name] = change
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Model and classifier benchmarks.")
+    parser.add_argument("--suite", action="store_true",
+                        help="run the timing suite instead of the engine benchmarks")
+    parser.add_argument("--quick", action="store_true", help="suite: skip the largest models")
+    parser.add_argument("--output", default="benchmark_results.json",
+                        help="suite: where to write the JSON results")
+    parser.add_argument("--baseline", help="suite: JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="suite: relative slowdown counted as a regression, if it is "
+                             "also beyond the baseline's slowest round (default 0.20)")
+    args = parser.parse_args(argv)
+
+    if not args.suite:
+        benchmark_worker_engine()
+        benchmark_sharded()
+        benchmark_worker_memory()
+        benchmark_classifier()
+        return 0
+
+    current = run_suite(quick=args.quick)
+    with open(args.output, "w") as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {args.output}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, current, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
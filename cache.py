@@ -0,0 +1,73 @@
+import hashlib
+import json
+import os
+import pickle
+
+# Modules whose source determines cached results: the model itself and the
+# runners that build it and apply scenario agent_changes
+CODE_FILES = ("model.py", "vectorized.py", "metrics.py", "scheduler.py",
+              "scenario_tester.py", "run_simulation.py")
+
+def code_version():
+    """Hash of the simulation source, so editing the model invalidates cached results."""
+    digest = hashlib.sha256()
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in CODE_FILES:
+        with open(os.path.join(here, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+class ResultCache:
+    """Content-addressed, size-bounded LRU cache of simulation results on local disk."""
+
+    def __init__(self, directory=".sim_cache", max_bytes=512 * 1024 ** 2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = code_version()
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, params, agent_changes, steps, seed):
+        payload = json.dumps([params, agent_changes, steps, seed, self.version],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return None
+        os.utime(path)  # Mark as most recently used
+        return value
+
+    def put(self, key, value):
+        path = self._path(key)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".pkl"):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,161 @@
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+
+import numpy as np
+
+from checkpoint import restore, snapshot
+from model import METRICS
+from parallel import scenario_seed
+from scenario_tester import build_model
+from sweep import latin_hypercube, split_config
+
+def run_candidate(config, steps, seed, state=None, keep_state=False):
+    """Run one replicate of config to steps, continuing from a snapshot if given.
+
+    Returns (trajectory, snapshot or None); the trajectory is the collected
+    (steps, METRICS) array from step 0.
+    """
+    if state is None:
+        params, agent_changes = split_config(config)
+        model = build_model(params, agent_changes, seed)
+    else:
+        model = restore(state)
+    while model.schedule.steps < steps:
+        model.step()
+    return model.datacollector.as_array(), snapshot(model) if keep_state else None
+
+def prepare_targets(targets):
+    """{metric: values by step} or a DataFrame of METRICS columns -> {column index: array}."""
+    if hasattr(targets, "columns"):
+        targets = {name: targets[name].to_numpy() for name in targets.columns}
+    prepared = {}
+    for name, values in targets.items():
+        if name not in METRICS:
+            raise ValueError(f"Unknown target metric {name!r}; expected one of {METRICS}")
+        prepared[METRICS.index(name)] = np.asarray(values, dtype=float)
+    return prepared
+
+def trajectory_loss(trajectory, targets):
+    """Mean over target metrics of the RMSE against the target, scaled by the target's spread.
+
+    Only the steps both series cover are compared, so truncated runs are scored
+    on the start of the targets.
+    """
+    losses = []
+    for column, target in targets.items():
+        n = min(len(trajectory), len(target))
+        error = trajectory[:n, column] - target[:n]
+        scale = target.std() or abs(target.mean()) or 1.0
+        losses.append(np.sqrt(np.mean(error ** 2)) / scale)
+    return float(np.mean(losses))
+
+def halving_schedule(candidates, eta, full):
+    """Resource for each successive-halving rung, growing by eta up to full at the last one.
+
+    Rungs are added while keeping the best 1/eta still leaves more than one
+    candidate, so the last rung scores at most 2 * eta - 1 of them.
+    """
+    # Rungs until keeping the best 1/eta would leave a single candidate
+    rungs, remaining = 1, candidates
+    while remaining // eta > 1:
+        remaining //= eta
+        rungs += 1
+    return [max(1, math.ceil(full / eta ** (rungs - 1 - k))) for k in range(rungs)]
+
+def calibrate(targets, bounds, fixed=None, candidates=27, eta=3, steps=None, replicates=3,
+              resource="steps", max_workers=None, seed=0):
+    """Fit model parameters to target time series by successive halving.
+
+    targets maps METRICS names to per-step values (or is a DataFrame of them);
+    bounds maps parameters to (low, high), model params and agent_changes keys
+    alike, and fixed adds constant ones. Candidates are drawn by Latin
+    hypercube and all scored on a small budget; the best 1/eta go on to a
+    budget eta times larger. The last rung, reached once fewer than 2 * eta
+    candidates are left (3 of the default 27), runs them all at the full
+    budget, and the best of them is returned.
+
+    With resource="steps" the budget is the horizon: survivors continue from
+    their snapshots rather than re-simulating, and every candidate runs all
+    replicates. With resource="replicates" every run covers all steps and
+    survivors add replicates. Every candidate uses the same replicate seeds
+    (common random numbers), so differences in loss come from the parameters.
+
+    Returns {"params", "loss", "rungs", "simulated_steps"}: the best config
+    with its loss at the full budget, each rung's budget and scores, and the
+    steps simulated in total.
+    """
+    if resource not in ("steps", "replicates"):
+        raise ValueError(f"resource must be 'steps' or 'replicates', not {resource!r}")
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    targets = prepare_targets(targets)
+    if steps is None:
+        steps = max(len(values) for values in targets.values())
+    fixed = fixed or {}
+    configs = [dict(fixed, **point) for point in latin_hypercube(bounds, candidates, seed)]
+    seeds = [scenario_seed(f"replicate/{r}", seed) for r in range(replicates)]
+
+    full = steps if resource == "steps" else replicates
+    schedule = halving_schedule(len(configs), eta, full)
+    # Per candidate index: per-replicate losses and (for resource="steps") snapshots
+    losses = {i: [] for i in range(len(configs))}
+    states = {}
+    survivors = list(range(len(configs)))
+    rungs = []
+    simulated = 0
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for rung, budget in enumerate(schedule):
+            last = rung == len(schedule) - 1
+            rung_steps = budget if resource == "steps" else steps
+            jobs = {}
+            for i in survivors:
+                if resource == "steps":
+                    losses[i] = []
+                    replicate_range = range(replicates)
+                else:
+                    replicate_range = range(len(losses[i]), budget)
+                for r in replicate_range:
+                    state = states.pop((i, r), None)
+                    simulated += rung_steps - (state["steps"] if state else 0)
+                    jobs[i, r] = executor.submit(run_candidate, configs[i], rung_steps, seeds[r],
+                                                 state, resource == "steps" and not last)
+            for (i, r), future in jobs.items():
+                trajectory, state = future.result()
+                losses[i].append(trajectory_loss(trajectory, targets))
+                if state is not None:
+                    states[i, r] = state
+
+            scores = {i: float(np.mean(losses[i])) for i in survivors}
+            ranked = sorted(survivors, key=scores.get)
+            rungs.append({
+                "steps": rung_steps,
+                "replicates": replicates if resource == "steps" else budget,
+                "scores": [(configs[i], scores[i]) for i in ranked],
+            })
+            survivors = ranked if last else ranked[:max(1, len(ranked) // eta)]
+            # Drop snapshots of eliminated candidates
+            states = {key: value for key, value in states.items() if key[0] in survivors}
+
+    best = survivors[0]
+    return {"params": configs[best], "loss": scores[best], "rungs": rungs,
+            "simulated_steps": simulated}
+
+if __name__ == "__main__":
+    from scenario_tester import run_scenario
+
+    # Recover known parameters from the mean trajectory of ten of their runs
+    truth = {"automation_level": 0.45, "worker_adaptability": 0.6}
+    params, agent_changes = split_config(truth)
+    runs = [run_scenario("target", params, agent_changes, steps=50, seed=1000 + i)
+            for i in range(10)]
+    target = sum(runs) / len(runs)
+    candidates, replicates = 81, 5
+    result = calibrate(target[["Employment", "Corporate_Profit"]],
+                       {"automation_level": (0.1, 0.8), "worker_adaptability": (0.1, 0.9)},
+                       candidates=candidates, steps=50, replicates=replicates)
+    print(f"\nTarget parameters: {truth}")
+    print(f"Best fit: {result['params']} (loss {result['loss']:.4f})")
+    print(f"Simulated {result['simulated_steps']} steps vs "
+          f"{candidates * replicates * 50} for full runs of every candidate")
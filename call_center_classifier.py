@@ -1,6 +1,12 @@
+import codecs
 import json
+import os
+import re
 import difflib
-from collections import Counter
+import hashlib
+from bisect import bisect_left, bisect_right
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 
 # Basic keyword lists
 automatable_keywords = [
@@ -26,6 +32,11 @@ call_center_keywords = [
     "customer service", "call center", "user support", "help desk", "customer support"
 ]
 
+# Structural characters and complete string literals, for scanning JSON without parsing it
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_decoder = json.JSONDecoder()
+
 def fuzzy_match(text, keywords, threshold=0.85):
     """Return True if any keyword approximately matches the text."""
     for kw in keywords:
@@ -37,46 +48,472 @@ def fuzzy_match(text, keywords, threshold=0.85):
             return True
     return False
 
+class KeywordMatcher:
+    """fuzzy_match compiled for one keyword list.
+
+    Exact substrings are found with a single regex alternation. Fuzzy candidates
+    are pruned by length (ratio is at most 2*min(len)/total) and by shared
+    character counts (the quick_ratio bound) before the exact difflib ratio.
+    """
+
+    def __init__(self, keywords, threshold=0.85):
+        self.threshold = threshold
+        self.pattern = re.compile("|".join(map(re.escape, keywords))) if keywords else None
+        self.keywords = sorted(keywords, key=len)
+        self.lengths = [len(kw) for kw in self.keywords]
+        self.char_counts = [Counter(kw) for kw in self.keywords]
+
+    def match(self, text, state):
+        """Same result as fuzzy_match(text, keywords, threshold).
+
+        state caches the per-text SequenceMatcher and character counts, so
+        they are built at most once per text across matchers.
+        """
+        if self.pattern is not None and self.pattern.search(text):
+            return True
+
+        n = len(text)
+        t = self.threshold
+        # Keyword lengths that could reach the threshold, widened by one for float edges
+        lo = bisect_left(self.lengths, n * t / (2 - t) - 1)
+        hi = bisect_right(self.lengths, n * (2 - t) / t + 1)
+        for i in range(lo, hi):
+            kw = self.keywords[i]
+            total = len(kw) + n
+            if 2.0 * min(len(kw), n) / total < t:
+                continue
+            if not state:
+                state['counts'] = Counter(text)
+                state['seq'] = difflib.SequenceMatcher(None, '', text)
+            counts = state['counts']
+            shared = sum(min(c, counts[ch]) for ch, c in self.char_counts[i].items())
+            if 2.0 * shared / total < t:
+                continue
+            seq = state['seq']
+            seq.set_seq1(kw)
+            if seq.ratio() >= t:
+                return True
+        return False
+
+class ActivityClassifier:
+    """Label activities with the first category whose keywords match, like classify_activity."""
+
+    def __init__(self, categories, threshold=0.85):
+        self.matchers = [(label, KeywordMatcher(keywords, threshold))
+                         for label, keywords in categories]
+        # Identifies the keyword lists and threshold, for invalidating cached labels
+        payload = json.dumps([[label, list(keywords)] for label, keywords in categories] + [threshold])
+        self.fingerprint = hashlib.sha256(payload.encode()).hexdigest()
+
+    def classify(self, activity):
+        text = activity.lower()
+        state = {}
+        for label, matcher in self.matchers:
+            if matcher.match(text, state):
+                return label
+        return 'unclassified'
+
+CATEGORIES = [
+    ('automatable', automatable_keywords),
+    ('augmentable', augmentable_keywords),
+    ('irreplaceable', irreplaceable_keywords),
+]
+
+_classifier = ActivityClassifier(CATEGORIES)
+
 def classify_activity(activity):
     """Classify a single activity string."""
-    text = activity.lower()
+    return _classifier.classify(activity)
 
-    if fuzzy_match(text, automatable_keywords):
-        return 'automatable'
-    if fuzzy_match(text, augmentable_keywords):
-        return 'augmentable'
-    if fuzzy_match(text, irreplaceable_keywords):
-        return 'irreplaceable'
-    return 'unclassified'
+class ClassificationCache:
+    """Bounded LRU cache of activity labels, optionally persisted to disk.
 
+    Activities are keyed by their lower-cased text, which is all classify
+    looks at. A persisted cache is only reused if it was written for the same
+    keyword lists and threshold, so editing either invalidates it.
+    """
 
-def main():
-    with open('All_Industries_detailed.json', 'r') as f:
-        data = json.load(f)
+    def __init__(self, classifier=None, max_entries=100_000, path=None):
+        self.classifier = classifier or _classifier
+        self.max_entries = max_entries
+        self.path = path
+        self.labels = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path and os.path.exists(path):
+            with open(path, 'r') as f:
+                stored = json.load(f)
+            if stored.get('fingerprint') == self.classifier.fingerprint:
+                # Saved least recently used first; keep only the newest max_entries
+                items = list(stored['labels'].items())
+                self.labels.update(items[max(0, len(items) - max_entries):])
 
-    results = {}
-    for job in data:
-        raw_title = job.get('job_title', '')
-        # Clean title by removing newlines and extra spaces
-        title = " ".join(raw_title.split())
-        lower_title = title.lower()
-        if not any(kw in lower_title for kw in call_center_keywords):
+    def classify(self, activity):
+        text = activity.lower()
+        label = self.labels.get(text)
+        if label is not None:
+            self.hits += 1
+            self.labels.move_to_end(text)
+            return label
+
+        self.misses += 1
+        label = self.classifier.classify(text)
+        self.labels[text] = label
+        if len(self.labels) > self.max_entries:
+            self.labels.popitem(last=False)
+        return label
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self.labels),
+                'hit_rate': self.hits / lookups if lookups else 0.0}
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'fingerprint': self.classifier.fingerprint, 'labels': self.labels}, f)
+        os.replace(tmp_path, self.path)
+
+
+def iter_array_elements(f, chunk_size=1 << 16):
+    """Yield the raw text of each object in a top-level JSON array, reading f in chunks.
+
+    Only the element being scanned is kept in memory, so memory use does not
+    grow with the file size.
+    """
+    buf = ''
+    pos = 0
+    depth = 0
+    start = None
+    while True:
+        m = _STRUCTURE.search(buf, pos)
+        string = m and m.group() == '"' and _STRING.match(buf, m.start())
+        if m is None or (m.group() == '"' and not string):
+            # Need more input: drop everything before the current element first
+            keep = start if start is not None else pos
+            buf, pos = buf[keep:], pos - keep
+            if start is not None:
+                start = 0
+            chunk = f.read(chunk_size)
+            if not chunk:
+                if depth or buf.strip():
+                    raise ValueError("Truncated JSON array")
+                return
+            buf += chunk
             continue
 
+        char = m.group()
+        pos = m.end()
+        if char == '"':
+            if depth == 0:
+                raise ValueError("Expected a top-level JSON array")
+            pos = string.end()
+        elif char in '{[':
+            if depth == 0 and char == '{':
+                raise ValueError("Expected a top-level JSON array")
+            if depth == 1:
+                start = m.start()
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 1:
+                yield buf[start:pos]
+                start = None
+            elif depth == 0:
+                return
+
+def top_level_value(raw, key, default=None):
+    """Decode only the value of key in the JSON object text raw."""
+    depth = 0
+    pos = 0
+    while True:
+        m = _STRUCTURE.search(raw, pos)
+        if m is None:
+            return default
+        char = m.group()
+        pos = m.end()
+        if char == '"':
+            string = _STRING.match(raw, m.start())
+            pos = string.end()
+            if depth == 1 and json.loads(string.group()) == key:
+                after = raw[pos:].lstrip()
+                if after.startswith(':'):
+                    value_start = len(raw) - len(after) + 1
+                    while raw[value_start].isspace():
+                        value_start += 1
+                    return _decoder.raw_decode(raw, value_start)[0]
+        elif char in '{[':
+            depth += 1
+        else:
+            depth -= 1
+
+def clean_title(raw_title):
+    """Clean title by removing newlines and extra spaces."""
+    return " ".join(raw_title.split())
+
+def is_call_center_title(title):
+    lower_title = title.lower()
+    return any(kw in lower_title for kw in call_center_keywords)
+
+def iter_raw_jobs(path):
+    """Yield the unparsed JSON text of each job (top-level array, or JSON Lines for .jsonl)."""
+    with open(path, 'r') as f:
+        if path.endswith('.jsonl'):
+            yield from (line for line in f if line.strip())
+        else:
+            yield from iter_array_elements(f)
+
+def iter_jobs(path, title_filter=is_call_center_title, stream=False):
+    """Yield (title, work_activities) for each job whose cleaned title passes title_filter.
+
+    With stream=True the file is read one job at a time: a top-level JSON
+    array, or JSON Lines if path ends in .jsonl. Only the title is decoded
+    before filtering, so rejected jobs never materialize their activities.
+    Memory stays flat, but the pure-Python scan is about 5x slower than
+    json.load, so streaming is only worth it for files that do not fit in memory.
+    """
+    if not stream:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        for job in data:
+            title = clean_title(job.get('job_title', ''))
+            if title_filter(title):
+                yield title, job.get('work_activities', [])
+        return
+
+    for raw in iter_raw_jobs(path):
+        title = clean_title(top_level_value(raw, 'job_title', ''))
+        if title_filter(title):
+            yield title, json.loads(raw).get('work_activities', [])
+
+def label_percentages(counts):
+    total = sum(counts.values())
+    return {k: round(counts[k] / total * 100, 2) for k in ['automatable', 'augmentable', 'irreplaceable']}
+
+# Per-process state for classify_all workers, set up once by _init_worker
+_worker_state = {}
+
+def _init_worker(title_filter, cache_entries):
+    _worker_state['title_filter'] = title_filter
+    _worker_state['cache'] = ClassificationCache(max_entries=cache_entries)
+
+def _classify_jobs(jobs):
+    """Filter and classify parsed jobs; returns (JSON Lines of per-job counts, counts by title).
+
+    Both are built here rather than in the parent, which only writes and merges them.
+    """
+    title_filter = _worker_state['title_filter']
+    cache = _worker_state['cache']
+    lines = []
+    totals = {}
+    for job in jobs:
+        title = clean_title(job.get('job_title', ''))
+        if title_filter is not None and not title_filter(title):
+            continue
         activities = job.get('work_activities', [])
+        if not activities:
+            continue
+        counts = dict(Counter(cache.classify(act) for act in activities))
+        lines.append(json.dumps({'job_title': title, 'counts': counts}) + '\n')
+        totals.setdefault(title, Counter()).update(counts)
+    return ''.join(lines), totals
+
+def _char_boundary(f, offset):
+    """First byte offset at or after offset that does not split a UTF-8 character."""
+    f.seek(offset)
+    while True:
+        byte = f.read(1)
+        if not byte or not 0x80 <= byte[0] < 0xC0:
+            return offset
+        offset += 1
+
+def _read_lines_range(path, start, end):
+    """Parse the JSON Lines records that start in bytes [start, end) of path."""
+    jobs = []
+    with open(path, 'rb') as f:
+        if start:
+            # Skip the line straddling start; the previous range owns it
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            if line.strip():
+                jobs.append(json.loads(line))
+    return jobs
+
+# Where a job may start: an object right after the array's '[' or a ','
+_ELEMENT_GUESS = re.compile(r'[\[,]\s*(?=\{)')
+_WHITESPACE = re.compile(r'\s*')
+
+def _read_array_range(path, start, end, confirmed):
+    """Parse the elements of a top-level JSON array that start in bytes [start, end) of path.
+
+    With confirmed, an element (or, at offset 0, the array) starts exactly at
+    start. Otherwise the first element is guessed, and may be wrong when a
+    string contains text like ', {}'; classify_all checks each guess against
+    the previous range. Returns (first, after, end, jobs): where the range's
+    first element starts (start itself when confirmed), the byte offset of the
+    first element at or past end (None once the array has closed), end moved
+    to a character boundary, and the parsed elements.
+    """
+    with open(path, 'rb') as f:
+        start, end = _char_boundary(f, start), _char_boundary(f, end)
+        f.seek(start)
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        text = decoder.decode(f.read(end - start))
+        limit = len(text)
+
+        def more():
+            # Read at least as much again as is held, so long elements stay linear
+            nonlocal text
+            chunk = f.read(max(1 << 16, len(text)))
+            text += decoder.decode(chunk, final=not chunk)
+            return bool(chunk)
+
+        def skip_whitespace(pos):
+            while True:
+                pos = _WHITESPACE.match(text, pos).end()
+                if pos < len(text) or not more():
+                    return pos
+
+        if not confirmed:
+            m = _ELEMENT_GUESS.search(text)
+            if m is None or m.end() >= limit:
+                return None, None, end, []
+            pos = m.end()
+            first = start + len(text[:pos].encode())
+        elif start == 0:
+            pos = skip_whitespace(0)
+            if text[pos:pos + 1] != '[':
+                raise ValueError("Expected a top-level JSON array")
+            pos = skip_whitespace(pos + 1)
+            if text[pos:pos + 1] == ']':
+                return start, None, end, []
+            first = start
+        else:
+            pos, first = 0, start
+
+        jobs = []
+        while pos < limit:
+            while True:
+                try:
+                    job, pos = _decoder.raw_decode(text, pos)
+                    break
+                except json.JSONDecodeError:
+                    if not more():
+                        raise
+            jobs.append(job)
+            pos = skip_whitespace(pos)
+            char = text[pos:pos + 1]
+            if char == ']':
+                return first, None, end, jobs
+            if char != ',':
+                raise ValueError("Truncated JSON array" if not char else
+                                 f"Expected ',' or ']' after an array element, got {char!r}")
+            pos = skip_whitespace(pos + 1)
+        return first, start + len(text[:pos].encode()), end, jobs
+
+def _classify_range(path, start, end, confirmed):
+    """Worker task: parse and classify the jobs starting in bytes [start, end) of path."""
+    if path.endswith('.jsonl'):
+        return None, None, end, _classify_jobs(_read_lines_range(path, start, end))
+    try:
+        first, after, end, jobs = _read_array_range(path, start, end, confirmed)
+    except ValueError:
+        if confirmed:
+            raise
+        return None, None, end, ('', {})  # A wrong guess; classify_all re-reads this range
+    return first, after, end, _classify_jobs(jobs)
+
+def classify_all(path='All_Industries_detailed.json',
+                 output_path='all_industries_classification.jsonl',
+                 title_filter=None, max_workers=None, chunk_bytes=1 << 20, cache_entries=100_000):
+    """Classify every job in the dataset on a process pool.
+
+    The file (a top-level JSON array, or JSON Lines if path ends in .jsonl)
+    is split into byte ranges of chunk_bytes. Each worker reads, parses,
+    filters and classifies the jobs that start in its range. The parent only
+    sees the results, so it does not limit the scaling. The classifier and
+    cache are built once per process. In an array, workers guess where their
+    first job starts; each guess is checked against where the previous range's
+    last job ended, and the rare wrong one is re-read from there.
+
+    Per-job label counts are appended to output_path as JSON Lines in input
+    order as ranges finish. Counts for repeated titles are merged and the
+    summary {title: percentages} dict is returned.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    lines = path.endswith('.jsonl')
+    size = os.path.getsize(path)
+
+    totals = {}
+    pending = deque()
+    expected = 0  # Byte offset of the next array element; None once the array has closed
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(title_filter, cache_entries)) as executor, \
+            open(output_path, 'w') as out:
+
+        def checked(result):
+            # An array range only counts if it started where the previous one left off
+            nonlocal expected
+            first, after, end, classified = result
+            if lines:
+                return classified
+            if expected is None or expected >= end:
+                if expected is None and classified[0]:
+                    raise ValueError("Extra data after the top-level JSON array")
+                return '', {}  # No element starts in this range
+            if first != expected:
+                first, after, end, classified = executor.submit(
+                    _classify_range, path, expected, end, True).result()
+            expected = after
+            return classified
+
+        def drain(limit):
+            # Collect finished ranges in order, keeping at most limit in flight
+            while len(pending) > limit:
+                text, counts_by_title = checked(pending.popleft().result())
+                out.write(text)
+                for title, counts in counts_by_title.items():
+                    if title in totals:
+                        totals[title].update(counts)
+                    else:
+                        totals[title] = counts
+
+        for start in range(0, size, chunk_bytes):
+            pending.append(executor.submit(_classify_range, path, start,
+                                           min(start + chunk_bytes, size), start == 0))
+            drain(2 * max_workers)
+        drain(0)
+    if not lines and expected is not None:
+        raise ValueError("Truncated JSON array")
+
+    return {title: label_percentages(counts) for title, counts in totals.items()}
+
+def main(path='All_Industries_detailed.json', stream=False,
+         cache_path='.classification_cache.json'):
+    cache = ClassificationCache(path=cache_path)
+
+    results = {}
+    for title, activities in iter_jobs(path, stream=stream):
         if not activities:
             continue
 
         counts = Counter()
         for act in activities:
-            label = classify_activity(act)
+            label = cache.classify(act)
             counts[label] += 1
 
         total = sum(counts.values())
         if total == 0:
             continue
 
-        percentages = {k: round(counts[k] / total * 100, 2) for k in ['automatable', 'augmentable', 'irreplaceable']}
+        percentages = label_percentages(counts)
         results[title] = percentages
 
         print(f"\nJob Title: {title}")
@@ -90,5 +527,11 @@ def main():
     print("\nSummary dictionary:\n")
     print(json.dumps(results, indent=4))
 
+    cache.save()
+    stats = cache.stats()
+    print(f"\nClassification cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['hit_rate']:.1%} hit rate)")
+    return results
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,129 @@
+import os
+import pickle
+
+import numpy as np
+
+from model import WorkFutureModel, WorkerAgent, CorporationAgent, GovernmentAgent
+
+WORKER_FIELDS = ("skill_level", "adaptability", "well_being")
+# Attributes set by Agent itself, which the model rebuilds on restore
+_AGENT_BASE_FIELDS = ("unique_id", "model", "pos")
+
+def _agent_fields(agent):
+    return {k: v for k, v in vars(agent).items() if k not in _AGENT_BASE_FIELDS}
+
+def snapshot(model):
+    """Capture a model's full state as plain Python/NumPy data and a collector copy.
+
+    Worker state is stored column-wise as arrays, so a snapshot costs about
+    25 bytes per worker. Restoring it and stepping reproduces the original
+    run exactly, RNG streams included.
+    """
+    if model.worker_array is not None:
+        workers = {name: getattr(model.worker_array, name).copy()
+                   for name in WORKER_FIELDS + ("employed",)}
+        worker_rng = model.worker_array.rng.bit_generator.state
+    else:
+        agents = list(model.schedule.agents_of_type(WorkerAgent))
+        workers = {name: np.fromiter((getattr(a, name) for a in agents), float, len(agents))
+                   for name in WORKER_FIELDS}
+        workers["employed"] = np.fromiter((a.employed for a in agents), bool, len(agents))
+        worker_rng = None
+
+    return {
+        "params": {
+            "num_workers": model.num_workers,
+            "num_corporations": model.num_corporations,
+            "vectorized": model.worker_array is not None,
+            "collect_every": model.collect_every,
+            "seed": model._seed,
+            "phases": model.schedule.phases,
+            "recent_steps": model.recent_steps,
+        },
+        "automation_level": model.automation_level,
+        "steps": model.schedule.steps,
+        "time": model.schedule.time,
+        "workers": workers,
+        "corporations": [_agent_fields(a) for a in model.schedule.agents_of_type(CorporationAgent)],
+        "government": [_agent_fields(a) for a in model.schedule.agents_of_type(GovernmentAgent)],
+        "random_state": model.random.getstate(),
+        "worker_random_state": model.worker_random.getstate(),
+        "worker_array_rng_state": worker_rng,
+        "collector": model.datacollector.copy(),
+    }
+
+def restore(state):
+    """Build a new model from a snapshot."""
+    model = WorkFutureModel(**state["params"])
+    model.automation_level = state["automation_level"]
+    model.schedule.steps = state["steps"]
+    model.schedule.time = state["time"]
+
+    workers = state["workers"]
+    if model.worker_array is not None:
+        for name, values in workers.items():
+            setattr(model.worker_array, name, values.copy())
+        model.worker_array.num_employed = int(np.count_nonzero(workers["employed"]))
+        model.worker_array.rng.bit_generator.state = state["worker_array_rng_state"]
+        model.num_employed = model.worker_array.num_employed
+    else:
+        model.unemployed_workers.clear()
+        agents = list(model.schedule.agents_of_type(WorkerAgent))
+        for i, agent in enumerate(agents):
+            agent.skill_level = float(workers["skill_level"][i])
+            agent.adaptability = float(workers["adaptability"][i])
+            agent.well_being = float(workers["well_being"][i])
+            agent._employed = bool(workers["employed"][i])
+            if not agent._employed:
+                model.unemployed_workers[agent.unique_id] = agent
+        model.num_employed = len(agents) - len(model.unemployed_workers)
+
+    for type_class, key in ((CorporationAgent, "corporations"), (GovernmentAgent, "government")):
+        for agent, fields in zip(model.schedule.agents_of_type(type_class), state[key]):
+            vars(agent).update(fields)
+
+    model.random.setstate(state["random_state"])
+    model.worker_random.setstate(state["worker_random_state"])
+
+    model.datacollector = state["collector"].copy()
+    return model
+
+def save_checkpoint(model, path, run_params=None):
+    """Write a snapshot of model to path (atomically, so a crash never leaves half a file).
+
+    run_params, if given, records the WorkFutureModel params the run was
+    started with, so run_resumable can tell which run a checkpoint belongs to.
+    """
+    state = snapshot(model)
+    state["run_params"] = run_params
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+def _load_state(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+def load_checkpoint(path):
+    return restore(_load_state(path))
+
+def run_resumable(params, steps, path, checkpoint_every=100):
+    """Run WorkFutureModel(**params) to steps, checkpointing to path and resuming from it.
+
+    A checkpoint left at path by a run with different params raises
+    ValueError instead of being continued.
+    """
+    if os.path.exists(path):
+        state = _load_state(path)
+        if state.get("run_params") != params:
+            raise ValueError(f"Checkpoint {path} belongs to a run with params "
+                             f"{state.get('run_params')}, not {params}; remove it to start over")
+        model = restore(state)
+    else:
+        model = WorkFutureModel(**params)
+    while model.schedule.steps < steps:
+        model.step()
+        if model.schedule.steps % checkpoint_every == 0:
+            save_checkpoint(model, path, params)
+    return model
@@ -0,0 +1,181 @@
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import os
+import sys
+
+# Only the standard library is imported up front: Mesa, pandas and matplotlib
+# are imported by the command that needs them, so `cli.py classify` or `--help`
+# start in a fraction of the time.
+
+DEFAULT_SWEEP = {
+    "automation_level": [0.1, 0.3, 0.5, 0.7],
+    "worker_adaptability": [0.1, 0.5, 0.9],
+    "corp_automation_tendency": [0.3, 0.9],
+}
+
+def render_figures(jobs, max_workers=None):
+    """Render (function, args, kwargs) figure jobs in parallel on a process pool.
+
+    Returns a callable that waits for them, so the caller can keep working
+    (writing results, printing) while the figures render.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(jobs))
+    if max_workers <= 1:
+        for func, args, kwargs in jobs:
+            func(*args, **kwargs)
+        return lambda: None
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    futures = [executor.submit(func, *args, **kwargs) for func, args, kwargs in jobs]
+
+    def wait():
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            executor.shutdown()
+    return wait
+
+def parse_value(text):
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+def parse_axes(specs):
+    """["automation_level=0.1,0.3", ...] -> {"automation_level": [0.1, 0.3], ...}"""
+    axes = {}
+    for spec in specs:
+        name, sep, values = spec.partition("=")
+        if not sep or not values:
+            raise argparse.ArgumentTypeError(f"expected name=value[,value...], got {spec!r}")
+        axes[name] = [parse_value(v) for v in values.split(",")]
+    return axes
+
+def cmd_run(args):
+    from scenario_tester import (analyze, compare_scenarios, create_scenarios, detailed_analysis,
+                                 plot_final_outcomes, run_all_cached, run_all_scenarios)
+
+    scenarios = create_scenarios()
+    if args.scenario:
+        unknown = set(args.scenario) - set(scenarios)
+        if unknown:
+            sys.exit(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+        scenarios = {name: scenarios[name] for name in args.scenario}
+
+    if args.no_cache:
+        data = run_all_scenarios(scenarios, args.workers, args.seed, args.steps)
+        results = {name: {"data": d, "analysis": analyze(d)} for name, d in data.items()}
+    else:
+        from cache import ResultCache
+
+        results = run_all_cached(scenarios, ResultCache(), args.workers, args.seed, args.steps)
+
+    analysis_results = {}
+    for name, entry in results.items():
+        if args.quiet:
+            analysis_results[name] = entry["analysis"]
+        else:
+            print(f"\n{scenarios[name]['description']}")
+            analysis_results[name] = detailed_analysis(name, entry["data"], entry["analysis"])
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    wait = lambda: None
+    if not args.no_figures:
+        scenario_data = {name: entry["data"] for name, entry in results.items()}
+        figure = dict(dpi=args.dpi, show=False)
+        wait = render_figures([
+            (compare_scenarios, (scenario_data,),
+             dict(figure, path=os.path.join(args.output_dir, "scenario_comparison.png"))),
+            (plot_final_outcomes, (analysis_results,),
+             dict(figure, path=os.path.join(args.output_dir, "final_outcomes_comparison.png"))),
+        ], args.workers)
+
+    path = os.path.join(args.output_dir, "scenario_analysis.json")
+    with open(path, "w") as f:
+        json.dump(analysis_results, f, indent=4)
+    wait()
+    print(f"\nWrote {path}" + ("" if args.no_figures else " and figures"))
+
+def cmd_sweep(args):
+    from sweep import grid, latin_hypercube, run_sweep
+
+    axes = parse_axes(args.param) if args.param else DEFAULT_SWEEP
+    if args.samples:
+        for name, values in axes.items():
+            if len(values) != 2:
+                sys.exit(f"--samples needs low,high bounds for {name}")
+        configs = latin_hypercube({name: tuple(v) for name, v in axes.items()}, args.samples,
+                                  args.seed)
+    else:
+        configs = grid(**axes)
+    ran = run_sweep(configs, args.store, steps=args.steps, replicates=args.replicates,
+                    max_workers=args.workers, base_seed=args.seed)
+    print(f"Ran {ran} cells into {args.store}/ ({len(configs)} configs x "
+          f"{args.replicates} replicates, finished cells skipped)")
+
+def cmd_classify(args):
+    import call_center_classifier as ccc
+
+    if args.parallel:
+        summary = ccc.classify_all(args.path, args.output, max_workers=args.workers)
+        print(f"Classified {len(summary)} job titles; per-job counts in {args.output}")
+    else:
+        ccc.main(args.path, stream=args.stream, cache_path=args.cache)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="AI Work Force simulation and classification.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the scenario_tester scenarios")
+    run.add_argument("--scenario", action="append",
+                     help="run only this scenario (repeatable; default all)")
+    run.add_argument("--steps", type=int, default=50)
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--no-cache", action="store_true", help="always re-simulate")
+    run.add_argument("--no-figures", action="store_true", help="skip rendering figures")
+    run.add_argument("--dpi", type=int, default=300)
+    run.add_argument("--quiet", action="store_true", help="skip the per-scenario report")
+    run.add_argument("--output-dir", default=".")
+    run.set_defaults(func=cmd_run)
+
+    sweep = commands.add_parser("sweep", help="run a parameter sweep into a Parquet store")
+    sweep.add_argument("--param", action="append", metavar="NAME=V1,V2,...",
+                       help="sweep axis (repeatable); with --samples, NAME=LOW,HIGH")
+    sweep.add_argument("--samples", type=int,
+                       help="Latin-hypercube sample count instead of a full grid")
+    sweep.add_argument("--store", default="sweep_results")
+    sweep.add_argument("--steps", type=int, default=50)
+    sweep.add_argument("--replicates", type=int, default=3)
+    sweep.add_argument("--seed", type=int, default=0)
+    sweep.set_defaults(func=cmd_sweep)
+
+    classify = commands.add_parser("classify", help="classify call-center job activities")
+    classify.add_argument("path", nargs="?", default="All_Industries_detailed.json")
+    classify.add_argument("--parallel", action="store_true",
+                          help="classify every job on a process pool into --output")
+    classify.add_argument("--output", default="all_industries_classification.jsonl")
+    classify.add_argument("--cache", default=".classification_cache.json",
+                          help="label cache file for the serial path")
+    classify.add_argument("--stream", action="store_true",
+                          help="serial path: read one job at a time (flat memory, ~5x slower)")
+    classify.set_defaults(func=cmd_classify)
+
+    for command in (run, sweep, classify):
+        command.add_argument("--workers", type=int, default=None,
+                             help="worker processes (default: one per CPU)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # Never open windows: figures are only saved, also in worker processes
+    os.environ["MPLBACKEND"] = "Agg"
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import copy
+
+import numpy as np
+
+class MetricsCollector:
+    """Drop-in replacement for Mesa's DataCollector for model-level metrics.
+
+    Values are written into preallocated NumPy columns (grown by doubling), so
+    collecting a step is a handful of array stores and building the DataFrame
+    is a single copy per column rather than a dict per row.
+    """
+
+    def __init__(self, columns, capacity=64):
+        self.columns = list(columns)
+        self.capacity = max(1, capacity)
+        self.size = 0
+        self.steps = np.empty(self.capacity, dtype=np.int64)
+        self.data = np.empty((len(self.columns), self.capacity))
+
+    def _grow(self):
+        self.capacity *= 2
+        steps = np.empty(self.capacity, dtype=np.int64)
+        steps[:self.size] = self.steps[:self.size]
+        data = np.empty((len(self.columns), self.capacity))
+        data[:, :self.size] = self.data[:, :self.size]
+        self.steps, self.data = steps, data
+
+    def collect(self, model):
+        """Record model.compute_metrics() for the model's current step."""
+        self.append(model.schedule.steps, model.compute_metrics())
+
+    def append(self, step, values):
+        if self.size == self.capacity:
+            self._grow()
+        self.steps[self.size] = step
+        self.data[:, self.size] = values
+        self.size += 1
+
+    @property
+    def model_vars(self):
+        """Column name -> collected values, as read by Mesa's ChartModule."""
+        return {name: self.data[i, :self.size] for i, name in enumerate(self.columns)}
+
+    def as_array(self):
+        """Collected values as a (rows, columns) array."""
+        return self.data[:, :self.size].T.copy()
+
+    def get_model_vars_dataframe(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.as_array(), columns=self.columns,
+                            index=pd.Index(self.steps[:self.size].copy()))
+
+    def copy(self):
+        """Independent copy holding only the collected rows (used by checkpoints)."""
+        other = MetricsCollector(self.columns, capacity=max(64, 2 * self.size))
+        other.steps[:self.size] = self.steps[:self.size]
+        other.data[:, :self.size] = self.data[:, :self.size]
+        other.size = self.size
+        return other
+
+class DownsampledCollector:
+    """Bounded-memory MetricsCollector for very long runs.
+
+    The first collected row is kept as is, the last recent rows are kept at full
+    resolution in a ring buffer, and everything in between is folded into at
+    most max_buckets min/mean/max buckets. When the buckets fill up, adjacent
+    pairs are merged and the bucket width doubles, so memory stays fixed
+    however many steps are collected while the whole run remains covered.
+
+    Frames list the initial row, one row per bucket (indexed by its first step)
+    and then the recent rows; with bounds=True they also carry <metric>_min
+    and <metric>_max columns.
+    """
+
+    def __init__(self, columns, recent=1024, max_buckets=1024):
+        self.columns = list(columns)
+        self.recent = max(1, recent)
+        self.max_buckets = max(2, max_buckets + max_buckets % 2)
+        n = len(self.columns)
+
+        self.initial_step = None
+        self.initial = np.empty(n)
+
+        # Ring buffer of the most recent rows; head is the oldest slot once full
+        self.steps = np.empty(self.recent, dtype=np.int64)
+        self.data = np.empty((n, self.recent))
+        self.head = 0
+        self.size = 0
+
+        # Completed buckets, oldest first; sums and counts keep merges exact
+        self.bucket_width = 1
+        self.num_buckets = 0
+        self.bucket_steps = np.empty(self.max_buckets, dtype=np.int64)
+        self.bucket_counts = np.empty(self.max_buckets, dtype=np.int64)
+        self.bucket_min = np.empty((n, self.max_buckets))
+        self.bucket_sum = np.empty((n, self.max_buckets))
+        self.bucket_max = np.empty((n, self.max_buckets))
+        # The bucket currently being filled by rows leaving the ring buffer
+        self._pending_count = 0
+        self._pending_step = 0
+        self._pending_min = np.empty(n)
+        self._pending_sum = np.empty(n)
+        self._pending_max = np.empty(n)
+
+    def collect(self, model):
+        """Record model.compute_metrics() for the model's current step."""
+        self.append(model.schedule.steps, model.compute_metrics())
+
+    def append(self, step, values):
+        if self.initial_step is None:
+            self.initial_step = step
+            self.initial[:] = values
+            return
+        if self.size == self.recent:
+            self._fold(self.steps[self.head], self.data[:, self.head])
+        else:
+            self.size += 1
+        self.steps[self.head] = step
+        self.data[:, self.head] = values
+        self.head = (self.head + 1) % self.recent
+
+    def _fold(self, step, values):
+        """Add a row leaving the ring buffer to the pending bucket."""
+        if self._pending_count == 0:
+            self._pending_step = step
+            self._pending_min[:] = values
+            self._pending_sum[:] = values
+            self._pending_max[:] = values
+        else:
+            np.minimum(self._pending_min, values, out=self._pending_min)
+            self._pending_sum += values
+            np.maximum(self._pending_max, values, out=self._pending_max)
+        self._pending_count += 1
+        if self._pending_count == self.bucket_width:
+            self._push_bucket(self._pending_step, self._pending_count, self._pending_min,
+                              self._pending_sum, self._pending_max)
+            self._pending_count = 0
+
+    def _push_bucket(self, step, count, low, total, high):
+        i = self.num_buckets
+        self.bucket_steps[i] = step
+        self.bucket_counts[i] = count
+        self.bucket_min[:, i] = low
+        self.bucket_sum[:, i] = total
+        self.bucket_max[:, i] = high
+        self.num_buckets += 1
+        if self.num_buckets == self.max_buckets:
+            self._merge_buckets()
+
+    def _merge_buckets(self):
+        """Merge adjacent bucket pairs, halving the bucket count."""
+        half = self.max_buckets // 2
+        self.bucket_steps[:half] = self.bucket_steps[0::2]
+        self.bucket_counts[:half] = self.bucket_counts[0::2] + self.bucket_counts[1::2]
+        self.bucket_min[:, :half] = np.minimum(self.bucket_min[:, 0::2], self.bucket_min[:, 1::2])
+        self.bucket_sum[:, :half] = self.bucket_sum[:, 0::2] + self.bucket_sum[:, 1::2]
+        self.bucket_max[:, :half] = np.maximum(self.bucket_max[:, 0::2], self.bucket_max[:, 1::2])
+        self.num_buckets = half
+        self.bucket_width *= 2
+
+    def _bucket_arrays(self):
+        """(steps, min, mean, max) of the completed buckets plus the pending one."""
+        b = self.num_buckets
+        steps = self.bucket_steps[:b]
+        counts = self.bucket_counts[:b]
+        low, total, high = self.bucket_min[:, :b], self.bucket_sum[:, :b], self.bucket_max[:, :b]
+        if self._pending_count:
+            steps = np.append(steps, self._pending_step)
+            counts = np.append(counts, self._pending_count)
+            low = np.column_stack([low, self._pending_min])
+            total = np.column_stack([total, self._pending_sum])
+            high = np.column_stack([high, self._pending_max])
+        return steps, low, total / np.maximum(counts, 1), high
+
+    def _recent_order(self):
+        start = self.head if self.size == self.recent else 0
+        return (np.arange(self.size) + start) % self.recent
+
+    def _rows(self):
+        """(steps, min, mean, max) of every output row, oldest first."""
+        if self.initial_step is None:
+            empty = np.empty((len(self.columns), 0))
+            return np.empty(0, dtype=np.int64), empty, empty, empty
+        order = self._recent_order()
+        bucket_steps, low, mean, high = self._bucket_arrays()
+        initial = self.initial[:, None]
+        recent = self.data[:, order]
+        steps = np.concatenate([[self.initial_step], bucket_steps, self.steps[order]])
+        return (steps,
+                np.hstack([initial, low, recent]),
+                np.hstack([initial, mean, recent]),
+                np.hstack([initial, high, recent]))
+
+    @property
+    def model_vars(self):
+        """Column name -> mean values per output row, as read by Mesa's ChartModule."""
+        _, _, mean, _ = self._rows()
+        return {name: mean[i] for i, name in enumerate(self.columns)}
+
+    def as_array(self):
+        """Mean values per output row as a (rows, columns) array."""
+        return self._rows()[2].T.copy()
+
+    def get_model_vars_dataframe(self, bounds=False):
+        import pandas as pd
+
+        steps, low, mean, high = self._rows()
+        frame = pd.DataFrame(mean.T, columns=self.columns, index=pd.Index(steps))
+        if bounds:
+            for i, name in enumerate(self.columns):
+                frame[f"{name}_min"] = low[i]
+                frame[f"{name}_max"] = high[i]
+        return frame
+
+    def copy(self):
+        return copy.deepcopy(self)
+
+def downsample_frame(data, max_points=1000):
+    """Reduce a metrics frame to at most about max_points rows of equal-width buckets.
+
+    Each output row holds the bucket means, indexed by the bucket's first step,
+    with <column>_min and <column>_max columns for the bucket extremes. Existing
+    _min/_max columns (from DownsampledCollector) are reduced with min/max, so
+    the bands still cover every collected value. Frames that are already small
+    enough are returned unchanged.
+    """
+    if len(data) <= max_points:
+        return data
+    width = -(-len(data) // max_points)
+    groups = np.arange(len(data)) // width
+    grouped = data.groupby(groups)
+    columns = [c for c in data.columns if not c.endswith(("_min", "_max"))]
+    frame = grouped[columns].mean()
+    for column in columns:
+        low = f"{column}_min" if f"{column}_min" in data else column
+        high = f"{column}_max" if f"{column}_max" in data else column
+        frame[f"{column}_min"] = grouped[low].min()
+        frame[f"{column}_max"] = grouped[high].max()
+    frame.index = data.index[::width]
+    return frame
+
+def plot_metric(ax, data, metric, label=None, max_points=1000):
+    """Plot one metric from a metrics frame, downsampled for long runs.
+
+    The mean is drawn as a line; where the frame carries min/max bounds they
+    are drawn as a shaded band in the same colour.
+    """
+    data = downsample_frame(data, max_points)
+    line, = ax.plot(data.index, data[metric], label=label)
+    if f"{metric}_min" in data and f"{metric}_max" in data:
+        ax.fill_between(data.index, data[f"{metric}_min"], data[f"{metric}_max"],
+                        color=line.get_color(), alpha=0.2, linewidth=0)
+    return line
@@ -1,27 +1,69 @@
 from mesa import Model, Agent
-from mesa.time import RandomActivation
-from mesa.datacollection import DataCollector
+from contextlib import nullcontext
 import random
+import time
 
-class WorkerAgent(Agent):
-    """Worker agent that decides on reskilling, adapting, or resisting automation."""
+import numpy as np
+
+from metrics import MetricsCollector, DownsampledCollector
+from profiling import StepProfiler
+from scheduler import PhasedActivation
+from vectorized import WorkerArray
+
+# Model-level metrics, in the order WorkFutureModel.compute_metrics returns them
+METRICS = ["Employment", "Average_Skill", "Worker_Wellbeing", "Corporate_Profit", "Automation_Level"]
+
+def python_random(seed_sequence):
+    """random.Random seeded from a NumPy SeedSequence."""
+    return random.Random(int.from_bytes(seed_sequence.generate_state(4).tobytes(), "little"))
+
+class WorkerAgent:
+    """Worker agent that decides on reskilling, adapting, or resisting automation.
+    
+    Workers are by far the most numerous agents, so this class implements
+    Mesa's Agent interface (unique_id, model, pos, random, step, advance)
+    with __slots__ instead of subclassing Agent, which would bring a
+    per-instance __dict__.
+    """
+    __slots__ = ("unique_id", "model", "pos", "skill_level", "adaptability",
+                 "_employed", "well_being")
     
     def __init__(self, unique_id, model):
-        super().__init__(unique_id, model)
-        self.skill_level = random.uniform(0.3, 0.9)
-        self.adaptability = random.uniform(0.2, 0.8)
-        self.employed = True
+        self.unique_id = unique_id
+        self.model = model
+        self.pos = None
+        self.skill_level = model.worker_random.uniform(0.3, 0.9)
+        self.adaptability = model.worker_random.uniform(0.2, 0.8)
+        self._employed = True
+        self.model.num_employed += 1
         self.well_being = 0.7
+    
+    @property
+    def employed(self):
+        return self._employed
+    
+    @employed.setter
+    def employed(self, value):
+        # Keep the model's running employment count and unemployed index in sync
+        if value != self._employed:
+            if value:
+                self.model.num_employed += 1
+                del self.model.unemployed_workers[self.unique_id]
+            else:
+                self.model.num_employed -= 1
+                self.model.unemployed_workers[self.unique_id] = self
+        self._employed = value
         
     def step(self):
         automation_threat = self.model.automation_level
+        rng = self.model.worker_random
         
         if automation_threat > self.skill_level:
-            if random.random() < self.adaptability:
+            if rng.random() < self.adaptability:
                 self.skill_level += 0.1
                 self.well_being -= 0.05
             else:
-                if random.random() < automation_threat - self.skill_level:
+                if rng.random() < automation_threat - self.skill_level:
                     self.employed = False
                     self.well_being -= 0.2
         
@@ -29,6 +71,13 @@ class WorkerAgent(Agent):
             self.well_being = min(1.0, self.well_being + 0.02)
         else:
             self.well_being = max(0.1, self.well_being - 0.05)
+    
+    def advance(self):
+        pass
+    
+    @property
+    def random(self):
+        return self.model.random
 
 class CorporationAgent(Agent):
     """Corporation that chooses between automation, augmentation, or human-centric strategies."""
@@ -40,8 +89,7 @@ class CorporationAgent(Agent):
         self.profit = 1.0
         
     def step(self):
-        employed_workers = len([w for w in self.model.schedule.agents 
-                              if isinstance(w, WorkerAgent) and w.employed])
+        employed_workers = self.model.num_employed
         
         if employed_workers > self.model.num_workers * 0.7:
             if self.profit > 0.8:
@@ -62,9 +110,7 @@ class GovernmentAgent(Agent):
         self.policy_type = "balanced"
         
     def step(self):
-        employed_workers = len([w for w in self.model.schedule.agents 
-                              if isinstance(w, WorkerAgent) and w.employed])
-        employment_rate = employed_workers / self.model.num_workers
+        employment_rate = self.model.employment_rate
         
         if employment_rate < 0.7:
             self.policy_type = "pro-worker"
@@ -75,25 +121,81 @@ class GovernmentAgent(Agent):
             self.policy_type = "balanced"
     
     def implement_reskilling_program(self):
-        for agent in self.model.schedule.agents:
-            if isinstance(agent, WorkerAgent) and not agent.employed:
+        with self.model.profile_phase("reskilling"):
+            if self.model.worker_array is not None:
+                self.model.worker_array.reskill_unemployed()
+                return
+            for agent in self.model.unemployed_workers.values():
                 agent.skill_level += 0.1
                 agent.adaptability += 0.05
 
+# Names accepted in WorkFutureModel(phases=...)
+AGENT_TYPES = {
+    "workers": WorkerAgent,
+    "corporations": CorporationAgent,
+    "government": GovernmentAgent,
+}
+
+def resolve_phases(phases):
+    """Map phase names to agent classes, checking every agent type appears exactly once."""
+    resolved = []
+    for phase in phases:
+        if phase in AGENT_TYPES.values():
+            resolved.append(phase)
+        elif phase in AGENT_TYPES:
+            resolved.append(AGENT_TYPES[phase])
+        else:
+            raise ValueError(f"Unknown phase {phase!r}; expected one of {list(AGENT_TYPES)}")
+    if sorted(cls.__name__ for cls in resolved) != sorted(cls.__name__ for cls in AGENT_TYPES.values()):
+        raise ValueError(f"phases must list each of {list(AGENT_TYPES)} exactly once, "
+                         f"got {list(phases)}")
+    return resolved
+
 class WorkFutureModel(Model):
     """Main simulation model for AI Work Force Odyssey."""
     
-    def __init__(self, num_workers=100, num_corporations=10, automation_level=0.3):
+    def __init__(self, num_workers=100, num_corporations=10, automation_level=0.3,
+                 vectorized=False, collect_every=1, seed=None, phases=None,
+                 profile=False, trace_allocations=False, recent_steps=None):
         super().__init__()  # Add this line to properly initialize the Model parent class
+        
+        # Independent RNG streams for the schedule and the workers. Without a seed,
+        # one is drawn from the global RNG so random.seed() still pins a run.
+        if seed is None:
+            seed = random.getrandbits(128)
+        self._seed = seed
+        self.seed_sequence = np.random.SeedSequence(seed)
+        schedule_seed, worker_seed = self.seed_sequence.spawn(2)
+        self.worker_seed = worker_seed
+        self.random = python_random(schedule_seed)
+        self.worker_random = python_random(worker_seed)
+        
         self.num_workers = num_workers
         self.num_corporations = num_corporations
         self.automation_level = automation_level
-        self.schedule = RandomActivation(self)
+        self.num_employed = 0  # Maintained by WorkerAgent.employed
+        self.unemployed_workers = {}  # unique_id -> WorkerAgent, also maintained there
+        
+        # phases, e.g. ["workers", "corporations", "government"], activates one
+        # agent type at a time; by default all agents are shuffled together
+        if phases is not None:
+            phases = resolve_phases(phases)
+        self.schedule = PhasedActivation(self, phases)
+        
+        # Opt-in per-phase / per-agent-type timing, see profiling.StepProfiler
+        self.profiler = StepProfiler(trace_allocations) if profile else None
+        self.schedule.profiler = self.profiler
         
         # Create agents
-        for i in range(self.num_workers):
-            worker = WorkerAgent(i, self)
-            self.schedule.add(worker)
+        if vectorized:
+            # Workers live in NumPy columns instead of the schedule
+            self.worker_array = WorkerArray(self.num_workers, seed=worker_seed)
+            self.num_employed = self.worker_array.num_employed
+        else:
+            self.worker_array = None
+            for i in range(self.num_workers):
+                worker = WorkerAgent(i, self)
+                self.schedule.add(worker)
         
         for i in range(self.num_corporations):
             corp = CorporationAgent(i + self.num_workers, self)
@@ -103,21 +205,99 @@ class WorkFutureModel(Model):
         gov = GovernmentAgent(self.num_workers + self.num_corporations, self)
         self.schedule.add(gov)
         
-        # Data collector
-        self.datacollector = DataCollector(
-            model_reporters={
-                "Employment": lambda m: sum(1 for a in m.schedule.agents 
-                                          if isinstance(a, WorkerAgent) and a.employed) / m.num_workers,
-                "Average_Skill": lambda m: sum(a.skill_level for a in m.schedule.agents 
-                                             if isinstance(a, WorkerAgent)) / m.num_workers,
-                "Worker_Wellbeing": lambda m: sum(a.well_being for a in m.schedule.agents 
-                                                if isinstance(a, WorkerAgent)) / m.num_workers,
-                "Corporate_Profit": lambda m: sum(a.profit for a in m.schedule.agents 
-                                                if isinstance(a, CorporationAgent)) / m.num_corporations,
-                "Automation_Level": lambda m: m.automation_level
-            }
-        )
+        # Data collector (records every collect_every-th step). With recent_steps,
+        # memory is bounded: only that many recent rows stay at full resolution
+        # and older ones are kept as min/mean/max buckets.
+        self.collect_every = collect_every
+        self.recent_steps = recent_steps
+        if recent_steps is None:
+            self.datacollector = MetricsCollector(METRICS)
+        else:
+            self.datacollector = DownsampledCollector(METRICS, recent=recent_steps,
+                                                      max_buckets=recent_steps)
+    
+    @property
+    def employment_rate(self):
+        return self.num_employed / self.num_workers
+    
+    def compute_metrics(self):
+        """Compute every entry of METRICS in a single pass over the agents."""
+        skill = well_being = profit = 0
+        for agent in self.schedule.agents_of_type(WorkerAgent):
+            skill += agent.skill_level
+            well_being += agent.well_being
+        for agent in self.schedule.agents_of_type(CorporationAgent):
+            profit += agent.profit
+        if self.worker_array is not None:
+            skill = self.worker_array.skill_level.sum()
+            well_being = self.worker_array.well_being.sum()
+        return (self.employment_rate,
+                skill / self.num_workers,
+                well_being / self.num_workers,
+                profit / self.num_corporations,
+                self.automation_level)
+    
+    def profile_phase(self, name):
+        """Context manager timing a phase of the step when profiling is on."""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.phase(name)
+    
+    def get_profile_dataframe(self):
+        """Per-step timings recorded with profile=True, one row per (step, section)."""
+        if self.profiler is None:
+            raise RuntimeError("profiling is off; pass profile=True")
+        return self.profiler.to_dataframe()
     
     def step(self):
-        self.datacollector.collect(self)
-        self.schedule.step()
\ No newline at end of file
+        if self.profiler is not None:
+            self.profiler.start_step(self.schedule.steps)
+        if self.schedule.steps % self.collect_every == 0:
+            with self.profile_phase("collect"):
+                self.datacollector.collect(self)
+        with self.profile_phase("agents"):
+            if self.worker_array is not None:
+                self._step_vectorized()
+            else:
+                self.schedule.step()
+        if self.profiler is not None:
+            self.profiler.end_step()
+    
+    def _step_worker_array(self, batch=None):
+        if self.profiler is None:
+            self.worker_array.step(self.automation_level, batch)
+            self.num_employed = self.worker_array.num_employed
+            return
+        start = time.perf_counter()
+        self.worker_array.step(self.automation_level, batch)
+        self.num_employed = self.worker_array.num_employed
+        calls = self.num_workers if batch is None else len(batch)
+        self.profiler.add_agent("WorkerArray", time.perf_counter() - start, calls)
+    
+    def _step_vectorized(self):
+        """Interleave batched worker updates with the scheduled agents in random order."""
+        if self.schedule.phases is not None:
+            for type_class in self.schedule.phases:
+                if type_class is WorkerAgent:
+                    self._step_worker_array()
+                else:
+                    self.schedule.step_type(type_class)
+            self.schedule.steps += 1
+            self.schedule.time += 1
+            return
+        
+        others = self.schedule.agents
+        self.random.shuffle(others)
+        batches = self.worker_array.activation_batches(len(others))
+        for batch, agent in zip(batches, others + [None]):
+            self._step_worker_array(batch)
+            if agent is None:
+                continue
+            if self.profiler is None:
+                agent.step()
+                continue
+            start = time.perf_counter()
+            agent.step()
+            self.profiler.add_agent(type(agent).__name__, time.perf_counter() - start)
+        self.schedule.steps += 1
+        self.schedule.time += 1
\ No newline at end of file
@@ -0,0 +1,77 @@
+from collections import defaultdict
+from contextlib import contextmanager
+import time
+import tracemalloc
+
+class StepProfiler:
+    """Per-step wall time and call counts by model phase and by agent type.
+
+    WorkFutureModel(profile=True) creates one and feeds it; nothing is timed
+    when profiling is off. With trace_allocations, each phase also records the
+    net and peak bytes allocated while it ran, via tracemalloc. Phases may
+    nest, and an outer phase's peak includes its inner phases. Unless it was
+    already running, tracemalloc only runs while an outermost phase does.
+    """
+
+    def __init__(self, trace_allocations=False):
+        self.trace_allocations = trace_allocations
+        self.rows = []
+        self.step = None
+        self._agents = defaultdict(lambda: [0.0, 0])
+        # Per open phase: [start bytes, highest peak seen before the last reset_peak]
+        self._open = []
+        self._started_tracing = False
+
+    def start_step(self, step):
+        self.step = step
+        self._agents.clear()
+
+    @contextmanager
+    def phase(self, name):
+        if self.trace_allocations:
+            self._enter_allocations()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            row = {"step": self.step, "kind": "phase", "section": name,
+                   "seconds": time.perf_counter() - start, "calls": 1}
+            if self.trace_allocations:
+                row["net_alloc_bytes"], row["peak_alloc_bytes"] = self._exit_allocations()
+            self.rows.append(row)
+
+    def _enter_allocations(self):
+        if not self._open and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        # reset_peak() below would lose the enclosing phases' peak so far
+        for entry in self._open:
+            entry[1] = max(entry[1], peak)
+        tracemalloc.reset_peak()
+        self._open.append([current, current])
+
+    def _exit_allocations(self):
+        current, peak = tracemalloc.get_traced_memory()
+        start_bytes, earlier_peak = self._open.pop()
+        peak = max(peak, earlier_peak)
+        if not self._open and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return current - start_bytes, peak - start_bytes
+
+    def add_agent(self, name, seconds, calls=1):
+        totals = self._agents[name]
+        totals[0] += seconds
+        totals[1] += calls
+
+    def end_step(self):
+        for name, (seconds, calls) in self._agents.items():
+            self.rows.append({"step": self.step, "kind": "agent", "section": name,
+                              "seconds": seconds, "calls": calls})
+
+    def to_dataframe(self):
+        """One row per (step, section); kind is "phase" or "agent"."""
+        import pandas as pd
+
+        return pd.DataFrame(self.rows)
@@ -0,0 +1,159 @@
+from concurrent.futures import ProcessPoolExecutor
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from model import METRICS
+from parallel import scenario_seed
+from scenario_tester import build_model, create_scenarios
+
+def _t_coverage(t, df):
+    """P(|T| < t) for Student's t with integer df (Abramowitz & Stegun 26.7.3-4)."""
+    theta = math.atan(t / math.sqrt(df))
+    c2 = math.cos(theta) ** 2
+    if df % 2:
+        term, total = 1.0, 1.0 if df > 1 else 0.0
+        for k in range(3, df - 1, 2):
+            term *= c2 * (k - 1) / k
+            total += term
+        return 2 / math.pi * (theta + math.sin(theta) * math.cos(theta) * total)
+    term = total = 1.0
+    for k in range(2, df, 2):
+        term *= c2 * (k - 1) / k
+        total += term
+    return math.sin(theta) * total
+
+def t_quantile(confidence, df):
+    """Two-sided Student-t critical value: P(|T| < t) = confidence with df degrees of freedom."""
+    low, high = 0.0, 1.0
+    while _t_coverage(high, df) < confidence:
+        high *= 2
+    for _ in range(100):
+        mid = (low + high) / 2
+        if _t_coverage(mid, df) < confidence:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2
+
+class RunningStats:
+    """Welford mean/variance accumulator over equally shaped NumPy arrays."""
+
+    def __init__(self, shape):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def update(self, values):
+        self.count += 1
+        delta = values - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (values - self.mean)
+
+    @property
+    def variance(self):
+        if self.count < 2:
+            return np.full(self.mean.shape, np.nan)
+        return self.m2 / (self.count - 1)
+
+    def half_width(self, confidence=0.95):
+        """Half-width of the Student-t confidence interval of the mean."""
+        if self.count < 2:
+            return np.full(self.mean.shape, np.nan)
+        return t_quantile(confidence, self.count - 1) * np.sqrt(self.variance / self.count)
+
+def run_replicate(params, agent_changes, steps, seed):
+    """Run one seeded replicate and return its (steps, metrics) array."""
+    model = build_model(params, agent_changes, seed)
+    for _ in range(steps):
+        model.step()
+    return model.datacollector.as_array()
+
+def _summary(trajectory):
+    """Final metric values followed by employment_change and skill_growth."""
+    first, last = trajectory[0], trajectory[-1]
+    employment = METRICS.index("Employment")
+    skill = METRICS.index("Average_Skill")
+    return np.concatenate([last, [last[employment] - first[employment],
+                                  last[skill] - first[skill]]])
+
+def _interval(mean, half_width):
+    return {"mean": float(mean), "ci_low": float(mean - half_width),
+            "ci_high": float(mean + half_width)}
+
+def run_replications(scenarios, replicates=30, steps=50, max_workers=None, base_seed=0,
+                     confidence=0.95, target_ci_width=None, min_replicates=5):
+    """Run seeded replicates of every scenario and summarise them with confidence intervals.
+
+    Replicates are spread over a process pool in rounds. Each round's per-step
+    metrics are folded into running accumulators in replicate order, so no
+    replicate DataFrames are kept and results do not depend on scheduling.
+    With target_ci_width set, a scenario stops early once every summary
+    interval (final values, employment_change, skill_growth) is narrower than it.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    trajectories = {name: RunningStats((steps, len(METRICS))) for name in scenarios}
+    summaries = {name: RunningStats(len(METRICS) + 2) for name in scenarios}
+    active = list(scenarios)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while active:
+            futures = {}
+            for name in active:
+                config = scenarios[name]
+                start = summaries[name].count
+                batch = range(start, min(start + max_workers, replicates))
+                futures[name] = [executor.submit(run_replicate, config['params'],
+                                                 config['agent_changes'], steps,
+                                                 scenario_seed(f"{name}/{i}", base_seed))
+                                 for i in batch]
+
+            for name, batch in futures.items():
+                for future in batch:
+                    trajectory = future.result()
+                    trajectories[name].update(trajectory)
+                    summaries[name].update(_summary(trajectory))
+
+            still_active = []
+            for name in active:
+                stats = summaries[name]
+                if stats.count >= replicates:
+                    continue
+                if (target_ci_width is not None and stats.count >= min_replicates
+                        and np.all(2 * stats.half_width(confidence) < target_ci_width)):
+                    continue
+                still_active.append(name)
+            active = still_active
+
+    results = {}
+    for name in scenarios:
+        stats = summaries[name]
+        half = stats.half_width(confidence)
+        results[name] = {
+            "replicates": stats.count,
+            "mean": pd.DataFrame(trajectories[name].mean, columns=METRICS),
+            "ci_half_width": pd.DataFrame(trajectories[name].half_width(confidence),
+                                          columns=METRICS),
+            "final_values": {metric: _interval(stats.mean[i], half[i])
+                             for i, metric in enumerate(METRICS)},
+            "employment_change": _interval(stats.mean[-2], half[-2]),
+            "skill_growth": _interval(stats.mean[-1], half[-1]),
+        }
+    return results
+
+if __name__ == "__main__":
+    results = run_replications(create_scenarios(), target_ci_width=0.05)
+    summary = {name: {k: v for k, v in result.items() if k not in ("mean", "ci_half_width")}
+               for name, result in results.items()}
+
+    with open("scenario_replications.json", "w") as f:
+        json.dump(summary, f, indent=4)
+
+    for name, result in summary.items():
+        employment = result["final_values"]["Employment"]
+        print(f"{name}: {result['replicates']} replicates, final employment "
+              f"{employment['mean']:.2%} [{employment['ci_low']:.2%}, {employment['ci_high']:.2%}]")
@@ -1,9 +1,26 @@
 from model import WorkFutureModel
-import matplotlib.pyplot as plt
-import pandas as pd
+from cache import ResultCache
+from metrics import plot_metric
+from parallel import run_parallel, scenario_seed
 
-def run_scenarios():
-    """Run different scenarios and collect results."""
+def run_single(name, automation_level, steps=50, recent_steps=None, seed=None):
+    """Run one scenario and return its collected data."""
+    print(f"Running scenario: {name}")
+    model = WorkFutureModel(automation_level=automation_level, recent_steps=recent_steps,
+                            seed=seed)
+    
+    for _ in range(steps):
+        model.step()
+    
+    return model.datacollector.get_model_vars_dataframe()
+
+def run_scenarios(max_workers=None, seed=0, cache=None, steps=50, recent_steps=None):
+    """Run different scenarios in parallel and collect results.
+    
+    With a ResultCache, scenarios whose parameters, seed and model code are
+    unchanged are loaded from it instead of re-simulated. For long horizons,
+    recent_steps bounds the memory each run's data takes (see WorkFutureModel).
+    """
     
     scenarios = {
         "Base": {"automation_level": 0.3},
@@ -11,21 +28,32 @@ def run_scenarios():
         "Low_Automation": {"automation_level": 0.1}
     }
     
-    results = {}
+    if recent_steps is not None:
+        scenarios = {name: dict(params, recent_steps=recent_steps)
+                     for name, params in scenarios.items()}
+    
+    results, keys = {}, {}
+    if cache is not None:
+        for name, params in scenarios.items():
+            keys[name] = cache.key(params, {}, steps, scenario_seed(name, seed))
+            entry = cache.get(keys[name])
+            if entry is not None:
+                results[name] = entry["data"]
     
-    for name, params in scenarios.items():
-        print(f"Running scenario: {name}")
-        model = WorkFutureModel(automation_level=params["automation_level"])
-        
-        for _ in range(50):  # Run for 50 steps
-            model.step()
-        
-        results[name] = model.datacollector.get_model_vars_dataframe()
+    jobs = {name: (name, params["automation_level"], steps, recent_steps)
+            for name, params in scenarios.items() if name not in results}
+    if jobs:
+        for name, data in run_parallel(run_single, jobs, max_workers=max_workers,
+                                       base_seed=seed).items():
+            results[name] = data
+            if cache is not None:
+                cache.put(keys[name], {"data": data})
     
-    return results
+    return {name: results[name] for name in scenarios}
 
-def plot_results(results):
+def plot_results(results, path="simulation_results.png", show=True):
     """Plot simulation results."""
+    import matplotlib.pyplot as plt
     
     fig, axes = plt.subplots(2, 2, figsize=(12, 10))
     fig.suptitle("AI Work Force Simulation Results", fontsize=16)
@@ -35,18 +63,20 @@ def plot_results(results):
     for idx, metric in enumerate(metrics):
         ax = axes[idx // 2, idx % 2]
         for scenario_name, data in results.items():
-            ax.plot(data.index, data[metric], label=scenario_name)
+            plot_metric(ax, data, metric, label=scenario_name)
         ax.set_title(metric)
         ax.set_xlabel("Steps")
         ax.set_ylabel(metric)
         ax.legend()
     
     plt.tight_layout()
-    plt.savefig("simulation_results.png")
-    plt.show()
+    plt.savefig(path)
+    if show:
+        plt.show()
+    plt.close(fig)
 
 if __name__ == "__main__":
-    results = run_scenarios()
+    results = run_scenarios(cache=ResultCache())
     plot_results(results)
     
     # Save final values
@@ -1,6 +1,9 @@
 from model import WorkFutureModel, WorkerAgent, CorporationAgent, GovernmentAgent
-import matplotlib.pyplot as plt
-import pandas as pd
+from cache import ResultCache
+from checkpoint import restore, snapshot
+from metrics import plot_metric
+from parallel import run_parallel, scenario_seed
+from concurrent.futures import ProcessPoolExecutor
 import json
 
 def create_scenarios():
@@ -44,37 +47,102 @@ def create_scenarios():
     }
     return scenarios
 
-def run_scenario(name, params, agent_changes):
-    """Run a single scenario with specified parameters."""
-    print(f"Running scenario: {name}")
-    
-    # Create a new model instance for each scenario
+def build_model(params, agent_changes, seed=None):
+    """Create a model for a scenario and apply its agent changes."""
+    if seed is not None:
+        params = dict(params, seed=seed)
     model = WorkFutureModel(**params)
-    
-    # Apply agent changes after model creation
+    apply_agent_changes(model, agent_changes)
+    return model
+
+def apply_agent_changes(model, agent_changes):
+    """Apply a scenario's agent changes to a new or restored model."""
     if "worker_adaptability" in agent_changes:
-        for agent in model.schedule.agents:
-            if isinstance(agent, WorkerAgent):
-                agent.adaptability = agent_changes["worker_adaptability"]
+        if model.worker_array is not None:
+            model.worker_array.adaptability[:] = agent_changes["worker_adaptability"]
+        for agent in model.schedule.agents_of_type(WorkerAgent):
+            agent.adaptability = agent_changes["worker_adaptability"]
     
     if "corp_automation_tendency" in agent_changes:
-        for agent in model.schedule.agents:
-            if isinstance(agent, CorporationAgent):
-                agent.automation_tendency = agent_changes["corp_automation_tendency"]
+        for agent in model.schedule.agents_of_type(CorporationAgent):
+            agent.automation_tendency = agent_changes["corp_automation_tendency"]
     
     if "gov_policy" in agent_changes:
-        for agent in model.schedule.agents:
-            if isinstance(agent, GovernmentAgent):
-                agent.policy_type = agent_changes["gov_policy"]
+        for agent in model.schedule.agents_of_type(GovernmentAgent):
+            agent.policy_type = agent_changes["gov_policy"]
+
+def run_scenario(name, params, agent_changes, steps=50, seed=None):
+    """Run a single scenario with specified parameters."""
+    print(f"Running scenario: {name}")
+    
+    # Create a new model instance for each scenario
+    model = build_model(params, agent_changes, seed)
     
     # Run simulation
-    for _ in range(50):
+    for _ in range(steps):
         model.step()
     
     return model.datacollector.get_model_vars_dataframe()
 
-def compare_scenarios(scenarios_data):
+def run_all_scenarios(scenarios, max_workers=None, seed=0, steps=50):
+    """Run every scenario on a process pool; results keep the order of scenarios."""
+    jobs = {name: (name, config['params'], config['agent_changes'], steps)
+            for name, config in scenarios.items()}
+    return run_parallel(run_scenario, jobs, max_workers=max_workers, base_seed=seed)
+
+def run_all_cached(scenarios, cache, max_workers=None, seed=0, steps=50):
+    """Like run_all_scenarios, but reuse cached data and analysis for unchanged scenarios.
+
+    Returns {name: {"data": DataFrame, "analysis": dict}} in the order of scenarios.
+    """
+    keys = {name: cache.key(config['params'], config['agent_changes'], steps,
+                            scenario_seed(name, seed))
+            for name, config in scenarios.items()}
+    results = {name: cache.get(key) for name, key in keys.items()}
+    for entry in results.values():
+        if entry is not None and "analysis" not in entry:
+            entry["analysis"] = analyze(entry["data"])
+    
+    missing = {name: scenarios[name] for name, entry in results.items() if entry is None}
+    if missing:
+        for name, data in run_all_scenarios(missing, max_workers, seed, steps).items():
+            results[name] = {"data": data, "analysis": analyze(data)}
+            cache.put(keys[name], results[name])
+    return results
+
+def run_branch(state, agent_changes, steps):
+    """Restore a checkpoint, apply agent changes and run it for steps more steps."""
+    model = restore(state)
+    apply_agent_changes(model, agent_changes)
+    for _ in range(steps):
+        model.step()
+    return model.datacollector.get_model_vars_dataframe()
+
+def run_forked_scenarios(params, branches, warmup_steps, steps=50, seed=0, max_workers=None):
+    """Run a shared warm-up once, then fork one branch per {name: agent_changes}.
+    
+    Every branch starts from the same checkpoint, RNG state included, so the
+    branches differ only by their agent changes. Each returned DataFrame covers
+    all steps, warm-up included. max_workers=1 runs the branches in-process.
+    """
+    model = WorkFutureModel(**dict(params, seed=seed))
+    for _ in range(warmup_steps):
+        model.step()
+    state = snapshot(model)
+    
+    names = list(branches)
+    args = ([state] * len(names), [branches[n] for n in names], [steps - warmup_steps] * len(names))
+    if max_workers == 1:
+        results = map(run_branch, *args)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(run_branch, *args))
+    return dict(zip(names, results))
+
+def compare_scenarios(scenarios_data, path="scenario_comparison.png", dpi=300, show=True):
     """Create comparison plots for scenarios."""
+    import matplotlib.pyplot as plt
+    
     fig, axes = plt.subplots(2, 2, figsize=(15, 12))
     fig.suptitle("Scenario Comparisons", fontsize=16)
     
@@ -83,28 +151,74 @@ def compare_scenarios(scenarios_data):
     for idx, metric in enumerate(metrics):
         ax = axes[idx // 2, idx % 2]
         for name, data in scenarios_data.items():
-            ax.plot(data.index, data[metric], label=name)
+            plot_metric(ax, data, metric, label=name)
         ax.set_title(metric)
         ax.set_xlabel("Steps")
         ax.set_ylabel(metric)
         ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     
     plt.tight_layout()
-    plt.savefig("scenario_comparison.png", dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    if show:
+        plt.show()
+    plt.close(fig)
 
-def detailed_analysis(scenario_name, data):
-    """Provide detailed analysis for a specific scenario."""
-    print(f"\n=== Detailed Analysis: {scenario_name} ===")
+def plot_final_outcomes(analysis_results, path="final_outcomes_comparison.png", dpi=300,
+                        show=True):
+    """Bar chart of final employment, well-being and profit for each scenario."""
+    import matplotlib.pyplot as plt
     
-    # Calculate key metrics
+    fig = plt.figure(figsize=(12, 8))
+    scenarios_list = list(analysis_results.keys())
+    employment_values = [analysis_results[s]['final_values']['Employment'] for s in scenarios_list]
+    wellbeing_values = [analysis_results[s]['final_values']['Worker_Wellbeing'] for s in scenarios_list]
+    profit_values = [analysis_results[s]['final_values']['Corporate_Profit'] for s in scenarios_list]
+    
+    x = range(len(scenarios_list))
+    width = 0.25
+    
+    plt.bar([i - width for i in x], employment_values, width, label='Employment')
+    plt.bar(x, wellbeing_values, width, label='Worker Wellbeing')
+    plt.bar([i + width for i in x], profit_values, width, label='Corporate Profit')
+    
+    plt.xlabel('Scenarios')
+    plt.ylabel('Values')
+    plt.title('Final Outcomes by Scenario')
+    plt.xticks(x, scenarios_list, rotation=45, ha='right')
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(path, dpi=dpi, bbox_inches='tight')
+    if show:
+        plt.show()
+    plt.close(fig)
+
+def analyze(data):
+    """Calculate the key metrics reported by detailed_analysis."""
     final_values = data.iloc[-1]
     employment_change = data['Employment'].iloc[-1] - data['Employment'].iloc[0]
     skill_growth = data['Average_Skill'].iloc[-1] - data['Average_Skill'].iloc[0]
     
+    return {
+        "final_values": final_values.to_dict(),
+        "employment_change": employment_change,
+        "skill_growth": skill_growth
+    }
+
+def detailed_analysis(scenario_name, data, analysis=None):
+    """Provide detailed analysis for a specific scenario.
+    
+    A previously computed analysis (e.g. from the result cache) is reported as is.
+    """
+    print(f"\n=== Detailed Analysis: {scenario_name} ===")
+    
+    # Calculate key metrics
+    if analysis is None:
+        analysis = analyze(data)
+    final_values = analysis['final_values']
+    
     print(f"Final Employment: {final_values['Employment']:.2%}")
-    print(f"Employment Change: {employment_change:.2%}")
-    print(f"Skill Growth: {skill_growth:.2f}")
+    print(f"Employment Change: {analysis['employment_change']:.2%}")
+    print(f"Skill Growth: {analysis['skill_growth']:.2f}")
     print(f"Final Worker Well-being: {final_values['Worker_Wellbeing']:.2f}")
     print(f"Final Corporate Profit: {final_values['Corporate_Profit']:.2f}")
     
@@ -115,23 +229,18 @@ def detailed_analysis(scenario_name, data):
             steepest_decline_step = data['Employment'].diff().idxmin()
             print(f"Steepest Employment Decline: {steepest_decline:.2%} at step {steepest_decline_step}")
     
-    return {
-        "final_values": final_values.to_dict(),
-        "employment_change": employment_change,
-        "skill_growth": skill_growth
-    }
+    return analysis
 
 if __name__ == "__main__":
     scenarios = create_scenarios()
-    scenario_results = {}
     analysis_results = {}
     
-    # Run all scenarios
-    for name, config in scenarios.items():
-        print(f"\n{config['description']}")
-        data = run_scenario(name, config['params'], config['agent_changes'])
-        scenario_results[name] = data
-        analysis_results[name] = detailed_analysis(name, data)
+    # Run all scenarios, reusing cached results for unchanged ones
+    scenario_results = {}
+    for name, entry in run_all_cached(scenarios, ResultCache()).items():
+        print(f"\n{scenarios[name]['description']}")
+        scenario_results[name] = entry['data']
+        analysis_results[name] = detailed_analysis(name, entry['data'], entry['analysis'])
     
     # Compare scenarios
     compare_scenarios(scenario_results)
@@ -141,26 +250,6 @@ if __name__ == "__main__":
         json.dump(analysis_results, f, indent=4)
     
     # Create a summary visualization
-    plt.figure(figsize=(12, 8))
-    scenarios_list = list(analysis_results.keys())
-    employment_values = [analysis_results[s]['final_values']['Employment'] for s in scenarios_list]
-    wellbeing_values = [analysis_results[s]['final_values']['Worker_Wellbeing'] for s in scenarios_list]
-    profit_values = [analysis_results[s]['final_values']['Corporate_Profit'] for s in scenarios_list]
-    
-    x = range(len(scenarios_list))
-    width = 0.25
-    
-    plt.bar([i - width for i in x], employment_values, width, label='Employment')
-    plt.bar(x, wellbeing_values, width, label='Worker Wellbeing')
-    plt.bar([i + width for i in x], profit_values, width, label='Corporate Profit')
-    
-    plt.xlabel('Scenarios')
-    plt.ylabel('Values')
-    plt.title('Final Outcomes by Scenario')
-    plt.xticks(x, scenarios_list, rotation=45, ha='right')
-    plt.legend()
-    plt.tight_layout()
-    plt.savefig("final_outcomes_comparison.png", dpi=300, bbox_inches='tight')
-    plt.show()
+    plot_final_outcomes(analysis_results)
     
     print("\nScenario testing complete! Check scenario_comparison.png and scenario_analysis.json")
\ No newline at end of file
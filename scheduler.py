@@ -0,0 +1,53 @@
+import time
+
+from mesa.time import RandomActivationByType
+
+class PhasedActivation(RandomActivationByType):
+    """Scheduler that keeps agents in per-type buckets and can activate them in phases.
+
+    With phases (a list of agent classes), each step activates every agent of
+    the first class in random order, then every agent of the second, and so on.
+    Without phases all agents are shuffled together, exactly as in
+    RandomActivation. Either way agents_of_type only touches one bucket.
+    When a StepProfiler is attached, each agent's step is timed by type.
+    """
+
+    def __init__(self, model, phases=None):
+        super().__init__(model)
+        self.phases = phases
+        self.profiler = None
+
+    def agents_of_type(self, type_class):
+        return self.agents_by_type[type_class].values()
+
+    def _activate(self, agents, shuffle=True):
+        # Same key order and shuffle as BaseScheduler.do_each
+        agent_keys = list(agents.keys())
+        if shuffle:
+            self.model.random.shuffle(agent_keys)
+        profiler = self.profiler
+        if profiler is None:
+            for agent_key in agent_keys:
+                if agent_key in agents:
+                    agents[agent_key].step()
+            return
+
+        timer = time.perf_counter
+        for agent_key in agent_keys:
+            agent = agents.get(agent_key)
+            if agent is not None:
+                start = timer()
+                agent.step()
+                profiler.add_agent(type(agent).__name__, timer() - start)
+
+    def step_type(self, type_class, shuffle_agents=True):
+        self._activate(self.agents_by_type[type_class], shuffle_agents)
+
+    def step(self):
+        if self.phases is None:
+            self._activate(self._agents)
+        else:
+            for type_class in self.phases:
+                self.step_type(type_class)
+        self.steps += 1
+        self.time += 1
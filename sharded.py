@@ -0,0 +1,208 @@
+import multiprocessing
+from multiprocessing import connection, shared_memory
+import os
+import weakref
+
+import numpy as np
+
+from model import WorkFutureModel, CorporationAgent, GovernmentAgent
+from vectorized import WorkerArray
+
+# Shared-memory layout: a control block written by the coordinator, then one
+# row of aggregates per shard written by that shard
+AUTOMATION_LEVEL, PENDING_RESKILLS, STOP = range(3)
+CONTROL_SIZE = 3
+# Skill and well-being sums as of the start of the tick, employed count after it
+SKILL_SUM, WELL_BEING_SUM, NUM_EMPLOYED = range(3)
+ROW_SIZE = 3
+
+def _shard_main(shm_name, num_shards, shard, num_workers, seed, conn):
+    """Shard process: own a WorkerArray and step it once per coordinator tick."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        buf = np.ndarray(CONTROL_SIZE + num_shards * ROW_SIZE, dtype=np.float64, buffer=shm.buf)
+        control = buf[:CONTROL_SIZE]
+        row = buf[CONTROL_SIZE + shard * ROW_SIZE:CONTROL_SIZE + (shard + 1) * ROW_SIZE]
+        workers = WorkerArray(num_workers, seed=seed)
+        while True:
+            conn.recv_bytes()  # Tick start: control block is ready
+            if control[STOP]:
+                break
+            for _ in range(int(control[PENDING_RESKILLS])):
+                workers.reskill_unemployed()
+            row[SKILL_SUM] = workers.skill_level.sum()
+            row[WELL_BEING_SUM] = workers.well_being.sum()
+            workers.step(control[AUTOMATION_LEVEL])
+            row[NUM_EMPLOYED] = workers.num_employed
+            conn.send_bytes(b"")  # Tick done: row is written
+        del control, row, buf
+    except EOFError:
+        pass  # The coordinator is gone
+    finally:
+        shm.close()
+
+class ShardPool:
+    """Worker population split across processes, stepped in lockstep.
+
+    Stands in for the model's WorkerArray: step() runs one tick on every
+    shard and reskill_unemployed() is applied by the shards at the start of
+    the next one. Per tick, only the control block and three aggregates per
+    shard cross process boundaries.
+
+    Ticks are started and acknowledged over one pipe per shard rather than a
+    shared barrier, whose lock a killed shard could leave held. The shard
+    processes are waited on alongside their replies, so if one dies, even
+    from SIGKILL, step() shuts the pool down and raises RuntimeError.
+    """
+
+    def __init__(self, num_workers, num_shards, seed):
+        self.num_workers = num_workers
+        self.num_shards = num_shards
+        self.num_employed = num_workers
+        self.skill_sum = self.well_being_sum = 0.0
+
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=8 * (CONTROL_SIZE + num_shards * ROW_SIZE))
+        buf = np.ndarray(CONTROL_SIZE + num_shards * ROW_SIZE, dtype=np.float64,
+                         buffer=self._shm.buf)
+        buf[:] = 0
+        self._control = buf[:CONTROL_SIZE]
+        self._rows = buf[CONTROL_SIZE:].reshape(num_shards, ROW_SIZE)
+
+        # One shard keeps the model's worker stream, so it matches the in-process engine
+        seeds = [seed] if num_shards == 1 else seed.spawn(num_shards)
+        sizes = [len(part) for part in np.array_split(np.arange(num_workers), num_shards)]
+        pipes = [multiprocessing.Pipe() for _ in range(num_shards)]
+        self._conns = [parent for parent, _ in pipes]
+        self._processes = [
+            multiprocessing.Process(target=_shard_main, daemon=True,
+                                    args=(self._shm.name, num_shards, shard, size,
+                                          seeds[shard], child))
+            for shard, (size, (_, child)) in enumerate(zip(sizes, pipes))
+        ]
+        for process in self._processes:
+            process.start()
+        for _, child in pipes:
+            child.close()
+        self._finalizer = weakref.finalize(self, ShardPool._shutdown, self._shm,
+                                           self._conns, self._processes)
+
+    def step(self, automation_threat, idx=None):
+        """Step every shard's workers once; idx is not supported across shards."""
+        if idx is not None:
+            raise ValueError("ShardPool steps whole shards; use a phased schedule")
+        self._control[AUTOMATION_LEVEL] = automation_threat
+        self._tick()
+        self._control[PENDING_RESKILLS] = 0
+        self.skill_sum = self._rows[:, SKILL_SUM].sum()
+        self.well_being_sum = self._rows[:, WELL_BEING_SUM].sum()
+        self.num_employed = int(self._rows[:, NUM_EMPLOYED].sum())
+
+    def _tick(self):
+        """Start a tick on every shard and wait until each has finished it."""
+        try:
+            for conn in self._conns:
+                conn.send_bytes(b"")
+            waiting = dict(zip(self._conns, self._processes))
+            while waiting:
+                sentinels = {process.sentinel for process in waiting.values()}
+                ready = connection.wait(list(waiting) + list(sentinels))
+                if sentinels.intersection(ready):
+                    break
+                for conn in ready:
+                    conn.recv_bytes()
+                    del waiting[conn]
+            else:
+                return
+        except (EOFError, OSError):
+            pass
+        self.close()
+        failed = {shard: process.exitcode for shard, process in enumerate(self._processes)
+                  if process.exitcode}
+        raise RuntimeError(f"Shard process failed (exit codes by shard: {failed}); "
+                           "the shard pool has been shut down")
+
+    def reskill_unemployed(self):
+        self._control[PENDING_RESKILLS] += 1
+
+    @staticmethod
+    def _shutdown(shm, conns, processes):
+        control = np.ndarray(CONTROL_SIZE, dtype=np.float64, buffer=shm.buf)
+        control[STOP] = 1
+        del control  # shm cannot be closed while a view of it exists
+        for conn, process in zip(conns, processes):
+            if process.is_alive():
+                try:
+                    conn.send_bytes(b"")
+                except OSError:
+                    pass  # Exited since is_alive()
+        for process in processes:
+            process.join()
+        for conn in conns:
+            conn.close()
+        shm.close()
+        shm.unlink()
+
+    def close(self):
+        """Stop the shard processes and free the shared memory."""
+        self._control = self._rows = None
+        self._finalizer()
+
+class ShardedModel(WorkFutureModel):
+    """WorkFutureModel with its workers split across num_shards processes.
+
+    Shards step their workers in parallel; this process only runs the
+    corporations and the government on the aggregate counts. Activation is
+    phased (all workers, then corporations, then government), and with one
+    shard a run matches WorkFutureModel(vectorized=True, phases=[...]) with
+    the same seed exactly. More shards give each its own worker RNG stream,
+    so results then agree statistically rather than exactly (see
+    tests/test_sharded.py).
+
+    Call close(), or use the model as a context manager, to stop the shards.
+    """
+
+    def __init__(self, num_workers=100, num_corporations=10, automation_level=0.3,
+                 num_shards=None, collect_every=1, seed=None, recent_steps=None):
+        # The base model holds no workers; the shards do
+        super().__init__(num_workers=0, num_corporations=num_corporations,
+                         automation_level=automation_level, vectorized=True,
+                         collect_every=collect_every, seed=seed,
+                         phases=["workers", "corporations", "government"],
+                         recent_steps=recent_steps)
+        if num_shards is None:
+            num_shards = os.cpu_count() or 1
+        self.num_workers = num_workers
+        self.num_shards = max(1, min(num_shards, num_workers))
+        self.worker_array = ShardPool(num_workers, self.num_shards, self.worker_seed)
+        self.num_employed = num_workers
+
+    def compute_metrics(self):
+        shards = self.worker_array
+        profit = sum(agent.profit for agent in self.schedule.agents_of_type(CorporationAgent))
+        return (self.employment_rate,
+                shards.skill_sum / self.num_workers,
+                shards.well_being_sum / self.num_workers,
+                profit / self.num_corporations,
+                self.automation_level)
+
+    def step(self):
+        # The shards report their state at the start of the tick while stepping,
+        # so metrics are collected after the worker phase rather than before it
+        self.worker_array.step(self.automation_level)
+        if self.schedule.steps % self.collect_every == 0:
+            self.datacollector.collect(self)
+        self.num_employed = self.worker_array.num_employed
+        self.schedule.step_type(CorporationAgent)
+        self.schedule.step_type(GovernmentAgent)
+        self.schedule.steps += 1
+        self.schedule.time += 1
+
+    def close(self):
+        self.worker_array.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,117 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import hashlib
+import inspect
+import itertools
+import json
+import os
+
+import numpy as np
+
+from model import WorkFutureModel
+from parallel import scenario_seed
+from scenario_tester import build_model
+
+# Config keys passed to WorkFutureModel; everything else is an agent_changes key
+MODEL_PARAMS = set(inspect.signature(WorkFutureModel.__init__).parameters) - {"self"}
+
+def grid(**axes):
+    """Full factorial design: grid(automation_level=[0.1, 0.3], worker_adaptability=[0.2, 0.8])."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+def latin_hypercube(bounds, samples, seed=0):
+    """Latin-hypercube design over bounds {name: (low, high)}; integer bounds give integers."""
+    rng = np.random.default_rng(seed)
+    configs = [{} for _ in range(samples)]
+    for name, (low, high) in bounds.items():
+        # One point in each of the equal-width strata, strata shuffled per dimension
+        points = (rng.permutation(samples) + rng.random(samples)) / samples
+        integer = isinstance(low, int) and isinstance(high, int)
+        for config, point in zip(configs, points):
+            value = low + point * (high - low)
+            config[name] = int(round(value)) if integer else float(value)
+    return configs
+
+def split_config(config):
+    """Split a flat config into WorkFutureModel params and agent_changes."""
+    params = {k: v for k, v in config.items() if k in MODEL_PARAMS}
+    agent_changes = {k: v for k, v in config.items() if k not in MODEL_PARAMS}
+    return params, agent_changes
+
+def config_id(config):
+    """Stable short id for a config, used as its partition name in the store."""
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+def cell_path(store_dir, cid, replicate):
+    return os.path.join(store_dir, f"config_id={cid}", f"replicate={replicate}", "data.parquet")
+
+def run_cell(config, steps, seed, path):
+    """Run one sweep cell and write its per-step metrics to path."""
+    params, agent_changes = split_config(config)
+    model = build_model(params, agent_changes, seed)
+    for _ in range(steps):
+        model.step()
+
+    data = model.datacollector.get_model_vars_dataframe()
+    data.index.name = "step"
+    data = data.reset_index()
+    for key, value in config.items():
+        data[key] = value
+
+    # Write then rename so an interrupted cell never looks finished. The dot
+    # prefix keeps the partial file out of pyarrow's dataset discovery.
+    directory, name = os.path.split(path)
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, "." + name + ".tmp")
+    data.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+def run_sweep(configs, store_dir, steps=50, replicates=1, max_workers=None, base_seed=0):
+    """Run every (config, replicate) cell on a process pool into a Parquet store.
+
+    The store is partitioned as config_id=<id>/replicate=<r>/data.parquet and
+    can be read back with load_sweep. Cells already present are skipped, so an
+    interrupted sweep resumes where it stopped. At most two cells per worker are
+    in flight, keeping memory flat regardless of the number of configs.
+    Returns the number of cells run.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    os.makedirs(store_dir, exist_ok=True)
+
+    def pending_cells():
+        for config in configs:
+            cid = config_id(config)
+            for replicate in range(replicates):
+                path = cell_path(store_dir, cid, replicate)
+                if not os.path.exists(path):
+                    yield config, scenario_seed(f"{cid}/{replicate}", base_seed), path
+
+    completed = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = set()
+        for config, seed, path in pending_cells():
+            in_flight.add(executor.submit(run_cell, config, steps, seed, path))
+            if len(in_flight) >= 2 * max_workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+                completed += len(done)
+        for future in in_flight:
+            future.result()
+        completed += len(in_flight)
+    return completed
+
+def load_sweep(store_dir, columns=None, filters=None):
+    """Read a sweep store (or a filtered subset of it) into one DataFrame."""
+    import pandas as pd
+
+    return pd.read_parquet(store_dir, columns=columns, filters=filters)
+
+if __name__ == "__main__":
+    configs = grid(automation_level=[0.1, 0.3, 0.5, 0.7],
+                   worker_adaptability=[0.1, 0.5, 0.9],
+                   corp_automation_tendency=[0.3, 0.9])
+    ran = run_sweep(configs, "sweep_results", replicates=3)
+    print(f"Ran {ran} cells into sweep_results/")
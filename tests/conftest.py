@@ -0,0 +1,25 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Tests import the top-level modules directly, as the scripts do
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def permutation_p_value(a, b, permutations=10_000, seed=0):
+    """Two-sided permutation test p-value for a difference in means between samples a and b."""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    pooled = np.concatenate([a, b])
+    observed = abs(a.mean() - b.mean())
+    rng = np.random.default_rng(seed)
+    extreme = 0
+    for _ in range(permutations):
+        rng.shuffle(pooled)
+        if abs(pooled[:len(a)].mean() - pooled[len(a):].mean()) >= observed - 1e-12:
+            extreme += 1
+    return (extreme + 1) / (permutations + 1)
+
+@pytest.fixture
+def two_sample_p():
+    return permutation_p_value
@@ -0,0 +1,19 @@
+from benchmark import compare_results, round_times, timing
+
+def suite(**results):
+    return {"meta": {}, "results": results}
+
+def test_slowdown_within_baseline_spread_is_not_a_regression():
+    baseline = suite(noisy=timing([1.0, 1.3, 1.1]), steady=timing([1.0, 1.02, 1.01]))
+    current = suite(noisy=timing([1.25, 1.4]), steady=timing([1.25, 1.3]))
+    assert set(compare_results(baseline, current, threshold=0.20)) == {"steady"}
+
+def test_baseline_without_rounds_uses_its_best_time():
+    baseline = suite(old={"seconds": 1.0})
+    current = suite(old=timing([1.5]), new=timing([0.1]))
+    assert compare_results(baseline, current, threshold=0.20) == {"old": 0.5}
+
+def test_round_times_records_every_round():
+    rounds = round_times(lambda _: None, repeat=3, min_time=0.001)
+    assert len(rounds) == 3
+    assert timing(rounds)["seconds"] == min(rounds)
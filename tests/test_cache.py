@@ -0,0 +1,31 @@
+import os
+
+import cache
+from cache import ResultCache
+
+def test_round_trip_and_eviction(tmp_path):
+    results = ResultCache(str(tmp_path), max_bytes=10_000)
+    key = results.key({"automation_level": 0.3}, {}, 50, 1)
+    assert results.get(key) is None
+    results.put(key, {"data": list(range(10))})
+    assert results.get(key) == {"data": list(range(10))}
+
+    # A large entry pushes the cache over max_bytes and evicts the older one
+    big = results.key({"automation_level": 0.5}, {}, 50, 1)
+    results.put(big, b"x" * 9_950)
+    assert results.get(key) is None
+    assert results.get(big) == b"x" * 9_950
+
+def test_code_version_covers_runner_modules(tmp_path, monkeypatch):
+    # Changing how scenarios apply agent_changes must invalidate cached results
+    for name in ("scenario_tester.py", "run_simulation.py"):
+        assert name in cache.CODE_FILES
+    copy = tmp_path / "scenario_tester.py"
+    here = os.path.dirname(os.path.abspath(cache.__file__))
+    before = cache.code_version()
+    for name in cache.CODE_FILES:
+        with open(os.path.join(here, name), "rb") as src:
+            (tmp_path / name).write_bytes(src.read())
+    copy.write_bytes(copy.read_bytes() + b"\n# changed\n")
+    monkeypatch.setattr(cache, "__file__", str(tmp_path / "cache.py"))
+    assert cache.code_version() != before
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from calibrate import calibrate, halving_schedule, prepare_targets, trajectory_loss
+from model import METRICS
+
+@pytest.mark.parametrize("candidates, eta, full, expected", [
+    (27, 3, 50, [6, 17, 50]),
+    (81, 3, 81, [3, 9, 27, 81]),
+    (10, 2, 16, [4, 8, 16]),
+    (6, 3, 10, [4, 10]),
+    (5, 3, 10, [10]),
+    (1, 3, 10, [10]),
+])
+def test_halving_schedule(candidates, eta, full, expected):
+    assert halving_schedule(candidates, eta, full) == expected
+
+@pytest.mark.parametrize("eta", [2, 3, 4])
+def test_last_rung_runs_a_few_candidates_at_full_budget(eta):
+    for candidates in range(1, 200):
+        schedule = halving_schedule(candidates, eta, 100)
+        assert schedule[-1] == 100 and schedule == sorted(schedule)
+        remaining = candidates
+        for _ in schedule[:-1]:
+            remaining = max(1, remaining // eta)
+        assert remaining < 2 * eta
+
+def trajectory(**columns):
+    steps = len(next(iter(columns.values())))
+    data = np.zeros((steps, len(METRICS)))
+    for name, values in columns.items():
+        data[:, METRICS.index(name)] = values
+    return data
+
+def test_trajectory_loss_is_scaled_rmse():
+    target = np.array([1.0, 2.0, 3.0, 4.0])
+    targets = prepare_targets({"Employment": target})
+    assert trajectory_loss(trajectory(Employment=target), targets) == 0
+    shifted = trajectory(Employment=target + 0.5)
+    assert trajectory_loss(shifted, targets) == pytest.approx(0.5 / target.std())
+
+def test_trajectory_loss_averages_metrics_and_truncates():
+    targets = prepare_targets({"Employment": [0.5, 0.5, 0.5], "Average_Skill": [1.0, 3.0]})
+    run = trajectory(Employment=[0.6, 0.6], Average_Skill=[1.0, 3.0])
+    # Constant targets are scaled by their mean instead of their zero spread
+    assert trajectory_loss(run, targets) == pytest.approx((0.1 / 0.5 + 0) / 2)
+
+def test_prepare_targets_rejects_unknown_metrics():
+    with pytest.raises(ValueError):
+        prepare_targets({"Employmnet": [1.0]})
+
+def test_calibrate_budget_accounting():
+    target = {"Employment": [0.9] * 6}
+    result = calibrate(target, {"automation_level": (0.1, 0.8)}, fixed={"num_workers": 30},
+                       candidates=9, eta=3, replicates=1, max_workers=1)
+    assert [len(rung["scores"]) for rung in result["rungs"]] == [9, 3]
+    assert [rung["steps"] for rung in result["rungs"]] == [2, 6]
+    # Survivors continue from their snapshots: 9 runs of 2 steps, then 3 runs of 4 more
+    assert result["simulated_steps"] == 9 * 2 + 3 * 4
+    assert result["params"] == result["rungs"][-1]["scores"][0][0]
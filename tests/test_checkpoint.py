@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+from checkpoint import restore, run_resumable, save_checkpoint, snapshot
+from model import WorkFutureModel
+
+PHASES = ["workers", "corporations", "government"]
+
+def run_to(model, steps):
+    while model.schedule.steps < steps:
+        model.step()
+    return model
+
+@pytest.mark.parametrize("params", [
+    {},
+    {"vectorized": True},
+    {"phases": PHASES},
+    {"vectorized": True, "phases": PHASES},
+    {"recent_steps": 8},
+    {"vectorized": True, "recent_steps": 8},
+    {"collect_every": 3},
+], ids=["object", "vectorized", "phased", "phased-vectorized", "recent_steps",
+        "recent_steps-vectorized", "collect_every"])
+def test_restored_run_continues_bit_for_bit(params):
+    params = dict(params, num_workers=300, automation_level=0.5, seed=11)
+    original = run_to(WorkFutureModel(**params), 20)
+    state = pickle.loads(pickle.dumps(snapshot(original)))
+    run_to(original, 50)
+    resumed = run_to(restore(state), 50)
+    assert resumed.datacollector.get_model_vars_dataframe().equals(
+        original.datacollector.get_model_vars_dataframe())
+    workers = snapshot(resumed)["workers"]
+    for name, values in snapshot(original)["workers"].items():
+        assert (workers[name] == values).all()
+
+def test_run_resumable_continues_its_own_checkpoint(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    params = {"num_workers": 200, "seed": 4}
+    save_checkpoint(run_to(WorkFutureModel(**params), 10), path, params)
+    resumed = run_resumable(params, 30, path, checkpoint_every=10)
+    expected = run_to(WorkFutureModel(**params), 30)
+    assert resumed.datacollector.get_model_vars_dataframe().equals(
+        expected.datacollector.get_model_vars_dataframe())
+
+def test_run_resumable_rejects_a_checkpoint_with_other_params(tmp_path):
+    path = str(tmp_path / "run.ckpt")
+    run_resumable({"num_workers": 100, "seed": 4}, 10, path, checkpoint_every=5)
+    with pytest.raises(ValueError):
+        run_resumable({"num_workers": 100, "seed": 4, "automation_level": 0.6}, 20, path)
@@ -0,0 +1,70 @@
+import json
+import random
+
+import pytest
+
+import call_center_classifier as ccc
+from benchmark import reference_classify, synthetic_activities
+
+@pytest.fixture(scope="module")
+def activities():
+    return synthetic_activities(3000, seed=0)
+
+def test_compiled_classifier_matches_fuzzy_reference(activities):
+    mismatches = [(a, reference_classify(a), ccc.classify_activity(a)) for a in activities
+                  if reference_classify(a) != ccc.classify_activity(a)]
+    assert mismatches == []
+
+def test_keyword_labels():
+    assert ccc.classify_activity("Entering orders into the system") == "automatable"
+    assert ccc.classify_activity("Troubleshooting billing problems") == "augmentable"
+    assert ccc.classify_activity("Calming upset callers") == "irreplaceable"
+    assert ccc.classify_activity("zzzz qqqq") == "unclassified"
+
+def test_cache_load_respects_max_entries(tmp_path):
+    path = str(tmp_path / "labels.json")
+    cache = ccc.ClassificationCache(max_entries=1000, path=path)
+    for i in range(1000):
+        cache.classify(f"activity {i}")
+    cache.save()
+
+    small = ccc.ClassificationCache(max_entries=10, path=path)
+    assert list(small.labels) == [f"activity {i}" for i in range(990, 1000)]
+    small.classify("activity 999")
+    assert small.stats()["hits"] == 1
+
+def write_jobs(path, jobs, indent=None):
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            f.writelines(json.dumps(job, ensure_ascii=False) + "\n" for job in jobs)
+        else:
+            json.dump(jobs, f, indent=indent, ensure_ascii=False)
+
+@pytest.fixture(scope="module")
+def jobs(activities):
+    rng = random.Random(1)
+    jobs = []
+    for i in range(60):
+        kind = rng.choice(["Customer Service", "Help Desk", "Welder"])
+        jobs.append({
+            "job_title": f"  {kind}\nRepresentative {i} — é ",
+            # Text that looks like an array element boundary, inside a string
+            "notes": rng.choice(["", "see [1], {}, and {\"job_title\": \"x\"}", "ü" * 40]),
+            "work_activities": rng.sample(activities, rng.randrange(0, 12)),
+        })
+    return jobs
+
+@pytest.mark.parametrize("suffix, indent", [(".json", None), (".json", 2), (".jsonl", None)])
+@pytest.mark.parametrize("chunk_bytes", [64, 997, 1 << 20])
+def test_classify_all_matches_serial_main(tmp_path, jobs, suffix, indent, chunk_bytes):
+    serial_path = str(tmp_path / "serial.json")
+    write_jobs(serial_path, jobs)
+    serial = ccc.main(serial_path, cache_path=None)
+    path = str(tmp_path / ("jobs" + suffix))
+    write_jobs(path, jobs, indent)
+    output = str(tmp_path / "out.jsonl")
+    parallel = ccc.classify_all(path, output, title_filter=ccc.is_call_center_title,
+                                max_workers=2, chunk_bytes=chunk_bytes)
+    assert parallel == serial
+    with open(output) as f:
+        assert [json.loads(line)["job_title"] for line in f] == list(serial)
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from metrics import DownsampledCollector, MetricsCollector, downsample_frame
+
+COLUMNS = ["a", "b"]
+
+def raw_rows(n, seed=0):
+    """n collected rows every third step, with random values."""
+    rng = np.random.default_rng(seed)
+    return np.arange(n) * 3, rng.normal(size=(n, len(COLUMNS)))
+
+def assert_rows_cover(frame, steps, values, check_mean=True):
+    """Each frame row summarises the raw rows from its step up to the next row's step."""
+    index = frame.index.to_numpy()
+    assert index[0] == steps[0] and (np.diff(index) > 0).all()
+    ends = np.append(index[1:], steps[-1] + 1)
+    for start, end, (_, row) in zip(index, ends, frame.iterrows()):
+        covered = values[(steps >= start) & (steps < end)]
+        assert len(covered)
+        for i, name in enumerate(COLUMNS):
+            assert row[f"{name}_min"] == covered[:, i].min()
+            assert row[f"{name}_max"] == covered[:, i].max()
+            if check_mean:
+                assert row[name] == pytest.approx(covered[:, i].mean())
+
+@pytest.mark.parametrize("recent, max_buckets, n", [
+    (1, 2, 1), (1, 2, 2), (4, 2, 50), (4, 3, 50), (5, 7, 333), (16, 9, 1000), (8, 8, 8),
+    (8, 8, 9), (3, 5, 10_000),
+])
+def test_downsampled_rows_summarise_the_rows_they_cover(recent, max_buckets, n):
+    steps, values = raw_rows(n)
+    collector = DownsampledCollector(COLUMNS, recent=recent, max_buckets=max_buckets)
+    for step, row in zip(steps, values):
+        collector.append(step, row)
+    frame = collector.get_model_vars_dataframe(bounds=True)
+    assert_rows_cover(frame, steps, values)
+    # The most recent rows are kept as collected
+    tail = min(recent, n - 1)
+    if tail:
+        assert (frame.index[-tail:] == steps[-tail:]).all()
+        np.testing.assert_array_equal(frame[COLUMNS].to_numpy()[-tail:], values[-tail:])
+    # Memory is bounded: the initial row, at most max_buckets (+1 pending) buckets, recent
+    assert len(frame) <= 1 + collector.max_buckets + 1 + recent
+    np.testing.assert_allclose(collector.as_array(), frame[COLUMNS].to_numpy())
+
+def test_downsampled_copy_is_independent():
+    collector = DownsampledCollector(COLUMNS, recent=2, max_buckets=2)
+    steps, values = raw_rows(10)
+    for step, row in zip(steps[:5], values[:5]):
+        collector.append(step, row)
+    before = collector.get_model_vars_dataframe(bounds=True)
+    copy = collector.copy()
+    for step, row in zip(steps[5:], values[5:]):
+        collector.append(step, row)
+    assert copy.get_model_vars_dataframe(bounds=True).equals(before)
+
+@pytest.mark.parametrize("n, max_points", [(10, 20), (100, 10), (101, 10), (1000, 7)])
+def test_downsample_frame_buckets(n, max_points):
+    steps, values = raw_rows(n, seed=1)
+    frame = pd.DataFrame(values, columns=COLUMNS, index=steps)
+    result = downsample_frame(frame, max_points)
+    if n <= max_points:
+        assert result is frame
+        return
+    assert len(result) <= max_points
+    assert_rows_cover(result, steps, values)
+
+def test_downsample_frame_keeps_collector_bounds():
+    steps, values = raw_rows(2000, seed=2)
+    collector = DownsampledCollector(COLUMNS, recent=50, max_buckets=200)
+    for step, row in zip(steps, values):
+        collector.append(step, row)
+    result = downsample_frame(collector.get_model_vars_dataframe(bounds=True), max_points=40)
+    assert len(result) <= 40
+    # Bucket means are not weighted by row counts, but the bands stay exact
+    assert_rows_cover(result, steps, values, check_mean=False)
+
+def test_metrics_collector_grows():
+    collector = MetricsCollector(COLUMNS, capacity=1)
+    steps, values = raw_rows(100)
+    for step, row in zip(steps, values):
+        collector.append(step, row)
+    frame = collector.get_model_vars_dataframe()
+    assert (frame.index == steps).all()
+    np.testing.assert_array_equal(frame.to_numpy(), values)
@@ -0,0 +1,35 @@
+import pytest
+
+from model import CorporationAgent, GovernmentAgent, WorkerAgent, WorkFutureModel
+
+PHASES = ["workers", "corporations", "government"]
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_phases_accept_names_and_classes(vectorized):
+    by_name = WorkFutureModel(num_workers=200, seed=1, vectorized=vectorized, phases=PHASES)
+    by_class = WorkFutureModel(num_workers=200, seed=1, vectorized=vectorized,
+                               phases=[WorkerAgent, CorporationAgent, GovernmentAgent])
+    for _ in range(10):
+        by_name.step()
+        by_class.step()
+    assert by_name.datacollector.get_model_vars_dataframe().equals(
+        by_class.datacollector.get_model_vars_dataframe())
+
+@pytest.mark.parametrize("phases", [
+    ["worker", "corporations", "government"],  # Typo
+    ["corporations", "government"],  # Workers would never step
+    ["workers", "workers", "corporations", "government"],
+])
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_invalid_phases_are_rejected(phases, vectorized):
+    with pytest.raises(ValueError):
+        WorkFutureModel(num_workers=10, seed=1, vectorized=vectorized, phases=phases)
+
+def test_seeded_runs_repeat():
+    runs = []
+    for _ in range(2):
+        model = WorkFutureModel(num_workers=200, seed=3)
+        for _ in range(10):
+            model.step()
+        runs.append(model.datacollector.get_model_vars_dataframe())
+    assert runs[0].equals(runs[1])
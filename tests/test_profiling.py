@@ -0,0 +1,45 @@
+import tracemalloc
+
+import pytest
+
+from model import WorkFutureModel
+from profiling import StepProfiler
+
+def test_inner_phase_keeps_outer_peak():
+    profiler = StepProfiler(trace_allocations=True)
+    with profiler.phase("outer"):
+        block = bytearray(2_000_000)
+        del block
+        with profiler.phase("inner"):
+            pass
+    inner, outer = profiler.rows
+    assert inner["section"] == "inner" and outer["section"] == "outer"
+    assert outer["peak_alloc_bytes"] >= 2_000_000
+    assert inner["peak_alloc_bytes"] < 2_000_000
+
+def test_tracing_stops_after_outermost_phase():
+    assert not tracemalloc.is_tracing()
+    profiler = StepProfiler(trace_allocations=True)
+    with profiler.phase("outer"):
+        with profiler.phase("inner"):
+            assert tracemalloc.is_tracing()
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+
+@pytest.mark.parametrize("vectorized", [False, True])
+def test_profiling_does_not_change_results(vectorized):
+    runs = []
+    for profile in (False, True):
+        model = WorkFutureModel(num_workers=200, seed=5, vectorized=vectorized,
+                                profile=profile, trace_allocations=profile)
+        for _ in range(10):
+            model.step()
+        runs.append(model.datacollector.get_model_vars_dataframe())
+    assert runs[0].equals(runs[1])
+    assert not tracemalloc.is_tracing()
+
+def test_profile_dataframe_needs_profiling():
+    model = WorkFutureModel(num_workers=10, seed=1)
+    model.step()
+    with pytest.raises(RuntimeError, match="profile=True"):
+        model.get_profile_dataframe()
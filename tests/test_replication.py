@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from replication import RunningStats, run_replications, t_quantile
+
+@pytest.mark.parametrize("df, expected", [(1, 12.706), (4, 2.776), (9, 2.262), (29, 2.045),
+                                          (1000, 1.962)])
+def test_t_quantile_matches_tables(df, expected):
+    assert t_quantile(0.95, df) == pytest.approx(expected, abs=1e-3)
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(0).normal(3.0, 2.0, size=(25, 4, 3))
+    stats = RunningStats((4, 3))
+    for row in values:
+        stats.update(row)
+    assert stats.count == 25
+    np.testing.assert_allclose(stats.mean, values.mean(axis=0))
+    np.testing.assert_allclose(stats.variance, values.var(axis=0, ddof=1))
+    np.testing.assert_allclose(stats.half_width(),
+                               t_quantile(0.95, 24) * np.sqrt(values.var(axis=0, ddof=1) / 25))
+
+SCENARIOS = {"baseline": {"params": {"num_workers": 50, "automation_level": 0.3},
+                          "agent_changes": {}}}
+
+def test_early_stop_halts_at_min_replicates():
+    results = run_replications(SCENARIOS, replicates=20, steps=5, max_workers=1,
+                               target_ci_width=100.0, min_replicates=5)
+    assert results["baseline"]["replicates"] == 5
+
+def test_unreachable_target_runs_every_replicate():
+    results = run_replications(SCENARIOS, replicates=8, steps=5, max_workers=1,
+                               target_ci_width=1e-12, min_replicates=5)
+    assert results["baseline"]["replicates"] == 8
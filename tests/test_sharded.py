@@ -0,0 +1,58 @@
+from multiprocessing import shared_memory
+import os
+import signal
+
+import numpy as np
+import pytest
+
+from model import WorkFutureModel
+from sharded import ShardedModel
+
+PHASES = ["workers", "corporations", "government"]
+STEPS = 30
+
+def run_sharded(steps, **params):
+    with ShardedModel(**params) as model:
+        for _ in range(steps):
+            model.step()
+        return model.datacollector.get_model_vars_dataframe()
+
+def run_phased(steps, **params):
+    model = WorkFutureModel(vectorized=True, phases=PHASES, **params)
+    for _ in range(steps):
+        model.step()
+    return model.datacollector.get_model_vars_dataframe()
+
+@pytest.mark.parametrize("seed", [0, 7])
+def test_one_shard_matches_phased_vectorized_model(seed):
+    params = dict(num_workers=2000, num_corporations=10, automation_level=0.5, seed=seed)
+    sharded = run_sharded(STEPS, num_shards=1, **params)
+    phased = run_phased(STEPS, **params)
+    assert np.array_equal(sharded.to_numpy(), phased.to_numpy())
+
+@pytest.fixture(scope="module")
+def final_rows():
+    """Final metrics of 1- and 2-shard runs over the same seeds."""
+    return {num_shards: [run_sharded(STEPS, num_workers=1000, automation_level=0.5,
+                                     num_shards=num_shards, seed=seed).iloc[-1]
+                         for seed in range(16)]
+            for num_shards in (1, 2)}
+
+@pytest.mark.parametrize("metric", ["Employment", "Average_Skill"])
+def test_shard_count_does_not_change_results(final_rows, two_sample_p, metric):
+    one, two = ([row[metric] for row in final_rows[n]] for n in (1, 2))
+    assert two_sample_p(one, two) > 0.01
+
+def test_killed_shard_raises_instead_of_hanging():
+    model = ShardedModel(num_workers=2000, num_shards=2, seed=0)
+    model.step()
+    processes = model.worker_array._processes
+    shm_name = model.worker_array._shm.name
+    os.kill(processes[1].pid, signal.SIGKILL)
+    processes[1].join()
+    with pytest.raises(RuntimeError, match="Shard process failed"):
+        model.step()
+    assert not any(process.is_alive() for process in processes)
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=shm_name)
+    model.close()
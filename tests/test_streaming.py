@@ -0,0 +1,67 @@
+import io
+import json
+import random
+
+import pytest
+
+import call_center_classifier as ccc
+
+# Characters that trip up a naive scanner: quotes, escapes and brackets inside strings
+TRICKY = 'ab"\\{}[],: \n\té'
+
+def random_string(rng, length=8):
+    return "".join(rng.choice(TRICKY) for _ in range(rng.randrange(length)))
+
+def random_value(rng, depth=0):
+    kind = rng.randrange(5 if depth < 3 else 3)
+    if kind == 0:
+        return rng.choice([None, True, False, rng.randint(-5, 5), rng.random()])
+    if kind in (1, 2):
+        return random_string(rng)
+    if kind == 3:
+        return [random_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {random_string(rng) if rng.random() < 0.7 else "job_title": random_value(rng, depth + 1)
+            for _ in range(rng.randrange(4))}
+
+def random_jobs(rng, count):
+    jobs = []
+    for _ in range(count):
+        job = {"details": random_value(rng, 1)}
+        if rng.random() < 0.5:
+            job["nested"] = {"job_title": "not this one", "items": [random_value(rng, 2)]}
+        job["job_title"] = random_string(rng, 12)
+        job["work_activities"] = [random_value(rng, 3) for _ in range(rng.randrange(3))]
+        jobs.append(job)
+    return jobs
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 1 << 16])
+def test_array_elements_match_json_load(seed, chunk_size):
+    jobs = random_jobs(random.Random(seed), 30)
+    text = json.dumps(jobs, indent=2 if seed % 2 else None, ensure_ascii=seed < 2)
+    raws = list(ccc.iter_array_elements(io.StringIO(text), chunk_size))
+    assert [json.loads(raw) for raw in raws] == jobs
+    assert [ccc.top_level_value(raw, "job_title") for raw in raws] == [
+        job["job_title"] for job in jobs]
+
+def test_top_level_value_ignores_nested_keys():
+    raw = '{"nested": {"job_title": "inner"}, "a": "\\"job_title\\": 1", "job_title" : [1, {"b": 2}]}'
+    assert ccc.top_level_value(raw, "job_title") == [1, {"b": 2}]
+    assert ccc.top_level_value('{"nested": {"job_title": 1}}', "job_title", "none") == "none"
+
+@pytest.mark.parametrize("text", ['[{"a": 1}, {"b": ', '{"a": 1}', '[{"a": "unterminated}]'])
+def test_malformed_input_raises(text):
+    with pytest.raises(ValueError):
+        list(ccc.iter_array_elements(io.StringIO(text), 4))
+
+@pytest.mark.parametrize("suffix", [".json", ".jsonl"])
+def test_streamed_jobs_match_json_load(tmp_path, suffix):
+    jobs = random_jobs(random.Random(9), 40)
+    path = str(tmp_path / ("jobs" + suffix))
+    with open(path, "w") as f:
+        if suffix == ".jsonl":
+            f.writelines(json.dumps(job) + "\n" for job in jobs)
+        else:
+            json.dump(jobs, f)
+    expected = [(ccc.clean_title(job["job_title"]), job["work_activities"]) for job in jobs]
+    assert list(ccc.iter_jobs(path, lambda title: True, stream=True)) == expected
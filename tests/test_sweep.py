@@ -0,0 +1,32 @@
+import os
+
+from parallel import scenario_seed
+from sweep import cell_path, config_id, grid, load_sweep, run_sweep
+
+def test_partial_cells_are_ignored_by_load_sweep(tmp_path):
+    store = str(tmp_path / "store")
+    configs = grid(automation_level=[0.2, 0.6])
+    assert run_sweep(configs, store, steps=5, max_workers=1) == 2
+
+    # A cell interrupted mid-write leaves only its temporary file behind
+    path = cell_path(store, config_id({"automation_level": 0.9}), 0)
+    os.makedirs(os.path.dirname(path))
+    with open(os.path.join(os.path.dirname(path), ".data.parquet.tmp"), "wb") as f:
+        f.write(b"partial")
+
+    data = load_sweep(store)
+    assert sorted(data["automation_level"].unique()) == [0.2, 0.6]
+    assert len(data) == 2 * 5
+
+def test_finished_cells_are_skipped(tmp_path):
+    store = str(tmp_path / "store")
+    configs = grid(automation_level=[0.3])
+    assert run_sweep(configs, store, steps=3, max_workers=1) == 1
+    assert run_sweep(configs, store, steps=3, max_workers=1) == 0
+
+def test_cell_seeds_are_distinct_and_stable():
+    configs = grid(automation_level=[i / 1000 for i in range(1000)], worker_adaptability=[0.1, 0.9])
+    seeds = {scenario_seed(f"{config_id(config)}/{replicate}")
+             for config in configs for replicate in range(50)}
+    assert len(seeds) == len(configs) * 50
+    assert scenario_seed("a/0", 1) == scenario_seed("a/0", 1) != scenario_seed("a/0", 2)
@@ -0,0 +1,28 @@
+import pytest
+
+from model import WorkFutureModel
+
+SEEDS = range(30)
+STEPS = 30
+
+def final_metrics(vectorized, seed):
+    model = WorkFutureModel(num_workers=1000, automation_level=0.5, vectorized=vectorized,
+                            seed=seed)
+    for _ in range(STEPS):
+        model.step()
+    return model.datacollector.get_model_vars_dataframe().iloc[-1]
+
+@pytest.fixture(scope="module")
+def finals():
+    return {vectorized: [final_metrics(vectorized, seed) for seed in SEEDS]
+            for vectorized in (False, True)}
+
+@pytest.mark.parametrize("metric", ["Employment", "Average_Skill", "Worker_Wellbeing",
+                                    "Corporate_Profit"])
+def test_vectorized_engine_matches_object_engine(finals, metric, two_sample_p):
+    objects = [row[metric] for row in finals[False]]
+    arrays = [row[metric] for row in finals[True]]
+    assert two_sample_p(objects, arrays) > 0.01
+
+def test_vectorized_engine_is_seeded():
+    assert final_metrics(True, 7).equals(final_metrics(True, 7))
@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+
+class WorkerArray:
+    """Array-backed worker population that steps workers in batched updates."""
+
+    def __init__(self, num_workers, seed=None):
+        # seed may be an int or a SeedSequence spawned by WorkFutureModel
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.rng = np.random.default_rng(seed)
+        self.num_workers = num_workers
+        self.skill_level = self.rng.uniform(0.3, 0.9, num_workers)
+        self.adaptability = self.rng.uniform(0.2, 0.8, num_workers)
+        self.employed = np.ones(num_workers, dtype=bool)
+        self.well_being = np.full(num_workers, 0.7)
+        self.num_employed = num_workers
+
+    def activation_batches(self, num_other_agents):
+        """Split a random worker order into the runs RandomActivation would step
+        between the other agents, so workers still see mid-tick changes they make.
+
+        Returns num_other_agents + 1 index arrays.
+        """
+        order = self.rng.permutation(self.num_workers)
+        slots = np.sort(self.rng.choice(self.num_workers + num_other_agents,
+                                        num_other_agents, replace=False))
+        return np.split(order, slots - np.arange(num_other_agents))
+
+    def step(self, automation_threat, idx=None):
+        """Apply the WorkerAgent.step rules to the workers in idx (default: everyone)."""
+        if idx is None:
+            idx = slice(None)
+        skill = self.skill_level[idx]
+        well_being = self.well_being[idx]
+        employed = self.employed[idx]
+        n = len(skill)
+        at_risk = automation_threat > skill
+
+        # Same draws as WorkerAgent.step: reskill first, otherwise risk losing the job
+        reskill = at_risk & (self.rng.random(n) < self.adaptability[idx])
+        laid_off = at_risk & ~reskill & (self.rng.random(n) < automation_threat - skill)
+
+        skill[reskill] += 0.1
+        well_being[reskill] -= 0.05
+        self.num_employed -= int(np.count_nonzero(laid_off & employed))
+        employed[laid_off] = False
+        well_being[laid_off] -= 0.2
+
+        self.skill_level[idx] = skill
+        self.employed[idx] = employed
+        self.well_being[idx] = np.where(employed,
+                                        np.minimum(1.0, well_being + 0.02),
+                                        np.maximum(0.1, well_being - 0.05))
+
+    def reskill_unemployed(self):
+        """Vectorized GovernmentAgent.implement_reskilling_program."""
+        unemployed = ~self.employed
+        self.skill_level[unemployed] += 0.1
+        self.adaptability[unemployed] += 0.05
@@ -1,32 +1,267 @@
  
 # visualization.py
-from mesa.visualization.modules import ChartModule
-from mesa.visualization.ModularVisualization import ModularServer
+import argparse
+import asyncio
+import json
+import threading
+
+import tornado.ioloop
+import tornado.web
+import tornado.websocket
+
 from model import WorkFutureModel
 
-def create_server():
-    """Create a visualization server for the model."""
-    
-    chart_employment = ChartModule([
-        {"Label": "Employment", "Color": "Blue"},
-        {"Label": "Worker_Wellbeing", "Color": "Green"}
-    ])
-    
-    chart_corporate = ChartModule([
-        {"Label": "Corporate_Profit", "Color": "Red"},
-        {"Label": "Automation_Level", "Color": "Orange"}
+CHARTS = [
+    [{"Label": "Employment", "Color": "Blue"},
+     {"Label": "Worker_Wellbeing", "Color": "Green"}],
+    [{"Label": "Corporate_Profit", "Color": "Red"},
+     {"Label": "Automation_Level", "Color": "Orange"}],
+]
+
+class LiveRun:
+    """A WorkFutureModel stepping at full speed in a background thread.
+
+    The thread only steps the model; viewers read the collector's columns,
+    which are append-only, so the simulation never waits for the UI.
+    """
+
+    def __init__(self, params=None, steps=None):
+        params = params or {}
+        if params.get("recent_steps") is not None:
+            raise ValueError("LiveRun streams every collected row; use collect_every to thin them")
+        self.model = WorkFutureModel(**params)
+        self.steps = steps
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        model = self.model
+        while not self._stop.is_set():
+            if self.steps is not None and model.schedule.steps >= self.steps:
+                break
+            model.step()
+        # Record the final state too, as the collector only sees steps before stepping
+        model.datacollector.collect(model)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    def points(self, start):
+        """Rows collected from index start onwards, as (end, {"steps": [...], "series": ...})."""
+        collector = self.model.datacollector
+        end = collector.size  # Read first: rows below size are fully written
+        series = {name: collector.data[i, start:end].tolist()
+                  for i, name in enumerate(collector.columns)}
+        return end, {"steps": collector.steps[start:end].tolist(), "series": series}
+
+class ViewerSocket(tornado.websocket.WebSocketHandler):
+    """One dashboard viewer; the Broadcaster sends it new points."""
+
+    def initialize(self, broadcaster):
+        self.broadcaster = broadcaster
+        self.cursor = 0  # Index of the first row this viewer has not been sent
+        self.busy = False  # A send is still being flushed to this viewer
+
+    def open(self):
+        self.broadcaster.viewers.add(self)
+        # Bring the new viewer up to date straight away rather than on the next frame
+        self.broadcaster.send(self, {}, self.broadcaster.run.running)
+
+    def on_close(self):
+        self.broadcaster.viewers.discard(self)
+
+class Broadcaster:
+    """Pushes each viewer the points it has not seen, at most fps times a second.
+
+    A viewer whose previous message is still being flushed is skipped for that
+    frame and catches up on the next, so a slow viewer only gets coarser
+    updates and never holds back the others or the simulation.
+    """
+
+    def __init__(self, run, fps=10):
+        self.run = run
+        self.fps = fps
+        self.viewers = set()
+        self._callback = tornado.ioloop.PeriodicCallback(self.tick, 1000 / fps)
+
+    def start(self):
+        self._callback.start()
+
+    def stop(self):
+        self._callback.stop()
+
+    def tick(self):
+        # Checked before reading points: once the run has finished, they are final
+        running = self.run.running
+        # Viewers at the same cursor share one encoded message
+        encoded = {}
+        for viewer in list(self.viewers):
+            if not viewer.busy:
+                self.send(viewer, encoded, running)
+        if not running and all(v.cursor == self.run.model.datacollector.size
+                               for v in self.viewers):
+            self.stop()
+
+    def send(self, viewer, encoded, running):
+        start = viewer.cursor
+        if start not in encoded:
+            end, message = self.run.points(start)
+            message["running"] = running
+            encoded[start] = end, json.dumps(message)
+        end, text = encoded[start]
+        if end == start and running:
+            return
+        viewer.cursor = end
+        viewer.busy = True
+        try:
+            future = viewer.write_message(text)
+        except tornado.websocket.WebSocketClosedError:
+            self.viewers.discard(viewer)
+            return
+        future.add_done_callback(lambda _: setattr(viewer, "busy", False))
+
+class DashboardPage(tornado.web.RequestHandler):
+    def initialize(self, title):
+        self.title = title
+
+    def get(self):
+        self.write(PAGE.replace("{{title}}", self.title)
+                       .replace("{{charts}}", json.dumps(CHARTS)))
+
+def create_server(params=None, steps=None, fps=10, title="AI Work Force Simulation"):
+    """Create the dashboard app for one live run of WorkFutureModel(**params).
+
+    Returns (app, run, broadcaster); serve() starts all three.
+    """
+    run = LiveRun(params if params is not None else
+                  {"num_workers": 100, "num_corporations": 10, "automation_level": 0.3},
+                  steps)
+    broadcaster = Broadcaster(run, fps)
+    app = tornado.web.Application([
+        (r"/", DashboardPage, {"title": title}),
+        (r"/ws", ViewerSocket, {"broadcaster": broadcaster}),
     ])
-    
-    server = ModularServer(
-        WorkFutureModel,
-        [chart_employment, chart_corporate],
-        "AI Work Force Simulation",
-        {"num_workers": 100, "num_corporations": 10, "automation_level": 0.3}
-    )
-    
-    return server
+    return app, run, broadcaster
+
+async def serve(port=8521, **kwargs):
+    """Run the dashboard on http://127.0.0.1:port until cancelled."""
+    app, run, broadcaster = create_server(**kwargs)
+    server = app.listen(port, address="127.0.0.1")  # Never reachable from other hosts
+    broadcaster.start()
+    run.start()
+    print(f"Dashboard at http://127.0.0.1:{port}/")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        server.stop()
+        broadcaster.stop()
+        run.stop()
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{{title}}</title>
+<style>
+  body { font-family: sans-serif; margin: 20px; }
+  canvas { border: 1px solid #ccc; display: block; margin-bottom: 20px; }
+  .legend span { margin-right: 16px; }
+</style>
+</head>
+<body>
+<h2>{{title}}</h2>
+<div id="status">Connecting...</div>
+<div id="charts"></div>
+<script>
+const charts = {{charts}};
+const steps = [];
+const series = {};
+let dirty = false;
+
+const canvases = charts.map(lines => {
+  const legend = document.createElement("div");
+  legend.className = "legend";
+  legend.innerHTML = lines.map(l => `<span style="color:${l.Color}">${l.Label}</span>`).join("");
+  const canvas = document.createElement("canvas");
+  canvas.width = 900;
+  canvas.height = 300;
+  document.getElementById("charts").append(legend, canvas);
+  return canvas;
+});
+
+function draw() {
+  dirty = false;
+  const n = steps.length;
+  charts.forEach((lines, c) => {
+    const canvas = canvases[c], ctx = canvas.getContext("2d");
+    ctx.clearRect(0, 0, canvas.width, canvas.height);
+    if (n === 0) return;
+    // At most one point per pixel column
+    const stride = Math.max(1, Math.ceil(n / canvas.width));
+    let lo = Infinity, hi = -Infinity;
+    for (const l of lines) for (let i = 0; i < n; i += stride) {
+      const v = series[l.Label][i];
+      if (v < lo) lo = v;
+      if (v > hi) hi = v;
+    }
+    if (hi === lo) { hi += 1; lo -= 1; }
+    const x0 = steps[0], xs = Math.max(steps[n - 1] - x0, 1);
+    ctx.fillStyle = "#666";
+    ctx.fillText(hi.toPrecision(4), 2, 10);
+    ctx.fillText(lo.toPrecision(4), 2, canvas.height - 2);
+    for (const l of lines) {
+      ctx.strokeStyle = l.Color;
+      ctx.beginPath();
+      for (let i = 0; i < n; i += stride) {
+        const x = (steps[i] - x0) / xs * (canvas.width - 1);
+        const y = canvas.height - 1 - (series[l.Label][i] - lo) / (hi - lo) * (canvas.height - 1);
+        i === 0 ? ctx.moveTo(x, y) : ctx.lineTo(x, y);
+      }
+      ctx.stroke();
+    }
+  });
+}
+
+const ws = new WebSocket(`ws://${location.host}/ws`);
+ws.onmessage = event => {
+  const msg = JSON.parse(event.data);
+  // Plain loops: spreading a long history into push() overflows the call stack
+  for (const s of msg.steps) steps.push(s);
+  for (const [name, values] of Object.entries(msg.series)) {
+    const column = series[name] = series[name] || [];
+    for (const value of values) column.push(value);
+  }
+  document.getElementById("status").textContent =
+    `Step ${steps.length ? steps[steps.length - 1] : 0}` + (msg.running ? "" : " (finished)");
+  if (!dirty) { dirty = true; requestAnimationFrame(draw); }
+};
+ws.onclose = () => { document.getElementById("status").textContent += " - disconnected"; };
+</script>
+</body>
+</html>
+"""
 
 if __name__ == "__main__":
-    server = create_server()
-    server.port = 8521
-    server.launch()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Live dashboard for one simulation run.")
+    parser.add_argument("--port", type=int, default=8521)
+    parser.add_argument("--fps", type=float, default=10, help="viewer updates per second")
+    parser.add_argument("--steps", type=int, default=None, help="stop after this many steps")
+    parser.add_argument("--num-workers", type=int, default=100)
+    parser.add_argument("--num-corporations", type=int, default=10)
+    parser.add_argument("--automation-level", type=float, default=0.3)
+    parser.add_argument("--vectorized", action="store_true")
+    args = parser.parse_args()
+    params = {"num_workers": args.num_workers, "num_corporations": args.num_corporations,
+              "automation_level": args.automation_level, "vectorized": args.vectorized}
+    try:
+        asyncio.run(serve(args.port, params=params, steps=args.steps, fps=args.fps))
+    except KeyboardInterrupt:
+        pass